@@ -0,0 +1,42 @@
+"""Win rates and guess latency from the game-event log (events.py).
+
+A separate Streamlit app, so players of the game never see it:
+
+    streamlit run analytics.py --server.port 8502
+
+The log is only read when this page is opened, and then at most once a
+minute however many people are looking at it.
+"""
+import streamlit as st
+
+from events import attempt_rates, latency_percentiles, read_events, win_rates
+
+
+@st.cache_data(ttl=60, show_spinner="Loading game events…")
+def load_events():
+    return read_events()
+
+
+st.title("📊 Game analytics")
+frame = load_events()
+if frame.empty:
+    st.info("No game events logged yet.")
+    st.stop()
+
+finished = frame["kind"].isin(["win", "loss"])
+col1, col2, col3 = st.columns(3)
+col1.metric("Rounds started", int(frame["kind"].eq("start").sum()))
+col2.metric("Rounds finished", int(finished.sum()))
+col3.metric("Win rate", f"{frame.loc[finished, 'kind'].eq('win').mean():.0%}")
+
+st.subheader("By attempt")
+st.dataframe(attempt_rates(frame), use_container_width=True)
+
+st.subheader("By category")
+st.dataframe(win_rates(frame, "category"), use_container_width=True)
+
+st.subheader("By word")
+st.dataframe(win_rates(frame, "word"), use_container_width=True, height=400)
+
+st.subheader("Guess latency (ms)")
+st.dataframe(latency_percentiles(frame), use_container_width=True)
@@ -1,794 +1,564 @@
 import streamlit as st
-import random
-import string
-import requests
+import streamlit.components.v1 as components
+import os
+import time
+
+import engine
+import metrics
+from assets import CONFETTI_TRIGGER, loader_html
+from board import generate_board, near_misses
+from daily import load_daily, today
+from dictionary import check_remote, load_cache, load_executor, load_index
+from engine import BOARD_SIZE, DEMO_LIMIT, MAX_ATTEMPTS, SCORE_MAP, bonus_word_total, get_bonus_clues
+from events import load_event_log
+from leaderboard import load_leaderboard
+from prefetch import load_prefetcher
+from puzzles import load_pack
+from sessions import load_sessions
+from state import GameState
 
 # ---------------------------
 # Constants
 # ---------------------------
-BOARD_SIZE   = 4
-MAX_ATTEMPTS = 3
-DEMO_LIMIT   = 3
-SCORE_MAP    = {1: 10, 2: 5, 3: 3}
-
-KEY_STAGE        = "stage"
-KEY_ATTEMPTS     = "attempts"
-KEY_BOARD        = "board"
-KEY_TARGET_WORD  = "target_word"
-KEY_CLUE         = "clue"
-KEY_HISTORY      = "history"
-KEY_GUESS_KEY    = "guess_key"
-KEY_LAST_MSG     = "last_msg"
-KEY_USED_WORDS   = "used_words"
-KEY_TOTAL_SCORE  = "total_score"
-KEY_FEEDBACK     = "feedback"
-KEY_WORDS_PLAYED = "words_played"
-KEY_SELECTED     = "selected"    # list of (row, col) in selection order
-KEY_BONUS_WORDS  = "bonus_words"  # set of bonus words found this round
-KEY_DICT_CACHE   = "dict_cache"   # {word: True/False} to avoid repeat API calls
-
-WORDS = [
-    {"word": "STONE",  "clue": {"length": 5, "category": "Nature"}},
-    {"word": "PLANET", "clue": {"length": 6, "category": "Space"}},
-    {"word": "TIGER",  "clue": {"length": 5, "category": "Animals"}},
-    {"word": "FLAME",  "clue": {"length": 5, "category": "Nature"}},
-    {"word": "ORBIT",  "clue": {"length": 5, "category": "Space"}},
-    {"word": "CRANE",  "clue": {"length": 5, "category": "Animals"}},
-    {"word": "FROST",  "clue": {"length": 5, "category": "Nature"}},
-    {"word": "COMET",  "clue": {"length": 5, "category": "Space"}},
-]
-
-for key, default in [
-    (KEY_STAGE,        "home"),
-    (KEY_ATTEMPTS,     0),
-    (KEY_BOARD,        []),
-    (KEY_TARGET_WORD,  ""),
-    (KEY_CLUE,         {}),
-    (KEY_HISTORY,      []),
-    (KEY_GUESS_KEY,    0),
-    (KEY_LAST_MSG,     None),
-    (KEY_USED_WORDS,   []),
-    (KEY_TOTAL_SCORE,  0),
-    (KEY_FEEDBACK,     None),
-    (KEY_WORDS_PLAYED, 0),
-    (KEY_SELECTED,     []),
-    (KEY_BONUS_WORDS,  set()),
-    (KEY_DICT_CACHE,   {}),
-]:
-    if key not in st.session_state:
-        st.session_state[key] = default
+# Game rules (board size, attempts, scoring, clue schedule) live in engine.py
+DICT_HTTP_FALLBACK = False  # ask dictionaryapi.dev about words missing from the bundled list
+CLIENT_BOARD = True         # board runs in the browser and sends whole words; False = native buttons
+ASYNC_CHECKS = True         # with the fallback on, check unknown words in the background; board stays usable
+CHECK_POLL_SECONDS = 0.5
+LEADERBOARD_TOP = 5         # rows of the global leaderboard shown after each round
+HISTORY_PAGE = 10           # session history rows per page on the result screen
 
+KEY_GAME = "game"  # the session's GameState (see state.py)
 
-# ---------------------------
-# Game Logic
-# ---------------------------
-def generate_board(word):
-    board = [["" for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-    r = random.randint(0, BOARD_SIZE - 1)
-    c = random.randint(0, BOARD_SIZE - 1)
-    board[r][c] = word[0]
-    for letter in word[1:]:
-        neighbors = [
-            (r+dr, c+dc) for dr, dc in [(1,0),(-1,0),(0,1),(0,-1)]
-            if 0 <= r+dr < BOARD_SIZE and 0 <= c+dc < BOARD_SIZE and board[r+dr][c+dc] == ""
-        ]
-        if neighbors:
-            r, c = random.choice(neighbors)
-        else:
-            empty = [(i,j) for i in range(BOARD_SIZE) for j in range(BOARD_SIZE) if board[i][j] == ""]
-            if not empty: break
-            r, c = random.choice(empty)
-        board[r][c] = letter
-    for i in range(BOARD_SIZE):
-        for j in range(BOARD_SIZE):
-            if board[i][j] == "":
-                board[i][j] = random.choice(string.ascii_uppercase)
-    return board
-
-
-def word_exists(board, word):
-    rows, cols = len(board), len(board[0]) if board else 0
-    visited = [[False]*cols for _ in range(rows)]
-    def dfs(r, c, idx):
-        if idx == len(word): return True
-        if not (0 <= r < rows and 0 <= c < cols): return False
-        if visited[r][c] or board[r][c] != word[idx]: return False
-        visited[r][c] = True
-        for dr, dc in [(1,0),(-1,0),(0,1),(0,-1)]:
-            if dfs(r+dr, c+dc, idx+1):
-                visited[r][c] = False
-                return True
-        visited[r][c] = False
-        return False
-    return any(dfs(i, j, 0) for i in range(rows) for j in range(cols))
+metrics.start_export()  # no-op unless CLUE_METRICS_PORT / CLUE_METRICS_PATH is set
 
+board_component = components.declare_component(
+    "clue_board", path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "board")
+)
 
-def sanitize_guess(raw):
-    return "".join(filter(str.isalpha, raw)).upper()
+if KEY_GAME not in st.session_state:
+    # A reconnecting browser carries its session token in the URL
+    token = st.query_params.get("session")
+    st.session_state[KEY_GAME] = (token and load_sessions().resume(token)) or GameState(BOARD_SIZE)
 
 
-def get_bonus_clues(target, attempts_used):
-    clues = []
-    if attempts_used >= 1:
-        clues.append(f"🔡 **Starting letter:** {target[0]}")
-    if attempts_used >= 2:
-        mid = len(target) // 2
-        clues.append(f"🔠 **Letter {mid+1} in the word:** {target[mid]}")
-    return clues
+def game_state() -> GameState:
+    """This session's GameState, brought back from the session store if it was spilled while idle."""
+    return load_sessions().touch(st.session_state[KEY_GAME])
 
 
+# ---------------------------
+# Game Logic — rules in engine.py, dictionary and puzzle sources here
+# ---------------------------
 def pick_unused_word():
-    used = st.session_state[KEY_USED_WORDS]
-    available = [w for w in WORDS if w["word"] not in used]
-    if not available:
-        st.session_state[KEY_USED_WORDS] = []
-        available = WORDS
-    chosen = random.choice(available)
-    st.session_state[KEY_USED_WORDS].append(chosen["word"])
-    return chosen
+    return engine.pick_unused_word(game_state())
 
 
-def is_adjacent(r1, c1, r2, c2):
-    return abs(r1-r2) + abs(c1-c2) == 1
+def pick_board(target):
+    """Draw a precomputed board for target from the puzzle pack, else generate one."""
+    pack = load_pack()
+    if pack is not None and pack.rows == pack.cols == BOARD_SIZE:
+        puzzle = pack.pick(target)
+        if puzzle:
+            return puzzle["board"]
+    with metrics.timer("generate_board"):
+        return generate_board(target, BOARD_SIZE)
 
 
-def selected_word():
-    board = st.session_state[KEY_BOARD]
-    return "".join(board[r][c] for r, c in st.session_state[KEY_SELECTED])
+def log_event(kind, points=0, latency_ms=0.0):
+    """Record a game event for the analytics page; buffered, never waits on disk."""
+    game = game_state()
+    load_event_log().log(kind, game.player_id, game.target, game.clue.get("category", ""),
+                         game.attempts, points, latency_ms)
 
 
 # ---------------------------
 # Stage Transitions
 # ---------------------------
 def go_home():
-    st.session_state[KEY_STAGE]    = "home"
-    st.session_state[KEY_LAST_MSG] = None
-    st.session_state[KEY_FEEDBACK] = None
-    st.session_state[KEY_SELECTED] = []
-    st.session_state[KEY_BONUS_WORDS] = set()
+    engine.go_home(game_state())
 
 
 def start_new_game():
-    if st.session_state[KEY_WORDS_PLAYED] >= DEMO_LIMIT:
-        st.session_state[KEY_STAGE] = "subscribe"
+    game = game_state()
+    if engine.demo_over(game):
+        game.stage = "subscribe"
         return
     level = pick_unused_word()
-    st.session_state[KEY_TARGET_WORD] = level["word"].upper()
-    st.session_state[KEY_CLUE]        = level["clue"]
-    st.session_state[KEY_BOARD]       = generate_board(level["word"].upper())
-    st.session_state[KEY_ATTEMPTS]    = 0
-    st.session_state[KEY_GUESS_KEY]  += 1
-    st.session_state[KEY_LAST_MSG]    = None
-    st.session_state[KEY_FEEDBACK]    = None
-    st.session_state[KEY_SELECTED]    = []
-    st.session_state[KEY_BONUS_WORDS]  = set()
-    st.session_state[KEY_STAGE]       = "game"
-
-
-def go_result(msg_type, msg_text, history_entry):
-    st.session_state[KEY_HISTORY].append(history_entry)
-    st.session_state[KEY_LAST_MSG]     = (msg_type, msg_text)
-    st.session_state[KEY_FEEDBACK]     = None
-    st.session_state[KEY_WORDS_PLAYED]+= 1
-    st.session_state[KEY_SELECTED]     = []
-    st.session_state[KEY_STAGE]        = "result"
+    board = pick_board(level["word"].upper())
+    engine.deal(game, level, board, load_index())
+    log_event("start")
+    if DICT_HTTP_FALLBACK:
+        # Look up the guesses the bundled list can't settle while the player reads the clue
+        game.prefetch = load_prefetcher().submit(near_misses(board, load_index(), len(game.target)))
+
+
+def start_daily_game():
+    """Deal today's shared puzzle, worked out once per process for every session."""
+    game = game_state()
+    if engine.demo_over(game):
+        game.stage = "subscribe"
+        return
+    puzzle = load_daily(today(), BOARD_SIZE)
+    engine.deal(game, puzzle.level, puzzle.board, load_index(), puzzle.solutions)
+    game.daily = puzzle.day
+    log_event("start")
+    if DICT_HTTP_FALLBACK:
+        game.prefetch = load_prefetcher().submit(puzzle.misses)
 
 
+@metrics.timed("is_real_word")
 def is_real_word(word: str) -> bool:
-    """Check if word exists in English dictionary via free API. Cached per session."""
-    word = word.lower()
-    cache = st.session_state[KEY_DICT_CACHE]
-    if word in cache:
-        return cache[word]
-    try:
-        resp = requests.get(
-            f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}",
-            timeout=3
-        )
-        result = resp.status_code == 200
-    except Exception:
-        # If API unreachable, fail open (treat as real word) so game isn't broken
-        result = True
-    cache[word] = result
-    st.session_state[KEY_DICT_CACHE] = cache
-    return result
+    """Check if word is in the bundled English word list.
+
+    With DICT_HTTP_FALLBACK, words missing from the list are checked via the
+    free dictionary API instead. Those answers are shared by every session
+    through the process-wide lookup cache, which start_new_game warms.
+    """
+    word = word.upper()
+    if word in load_index():
+        return True
+    if not DICT_HTTP_FALLBACK:
+        return False
+    if word in load_cache():
+        load_prefetcher().note_guess(word)
+    return check_remote(word)
 
 
-def evaluate_guess(raw_guess):
-    clue        = st.session_state[KEY_CLUE]
-    target      = st.session_state[KEY_TARGET_WORD]
-    attempts    = st.session_state[KEY_ATTEMPTS]
-    bonus_words = st.session_state[KEY_BONUS_WORDS]
+def needs_lookup(guess, solved, traceable):
+    """Whether judging guess would wait on the remote dictionary."""
+    return (DICT_HTTP_FALLBACK and traceable and not solved
+            and guess not in load_index() and guess not in load_cache())
 
-    if attempts >= MAX_ATTEMPTS:
-        st.session_state[KEY_FEEDBACK] = ("error", "No attempts left!")
-        return
 
-    guess = sanitize_guess(raw_guess)
-    if not guess:
-        st.session_state[KEY_FEEDBACK] = ("warning", "No letters selected.")
-        return
-    if len(guess) != clue["length"]:
-        st.session_state[KEY_FEEDBACK] = ("warning", f"Need {clue['length']} letters, got {len(guess)}.")
-        return
+def evaluate_guess(raw_guess):
+    game = game_state()
+    submitted = time.perf_counter()
 
-    # Always clear the tile selection
-    st.session_state[KEY_SELECTED] = []
-
-    board = st.session_state[KEY_BOARD]
-
-    # ── Case 1: correct target word ──
-    if guess == target and word_exists(board, guess):
-        st.session_state[KEY_ATTEMPTS]  += 1
-        st.session_state[KEY_GUESS_KEY] += 1
-        attempt_number = st.session_state[KEY_ATTEMPTS]
-        pts = SCORE_MAP.get(attempt_number, 0)
-        st.session_state[KEY_TOTAL_SCORE] += pts
-        go_result("win",
-            f"🎉 Correct! You found **{target}** on attempt {attempt_number} — **+{pts} points!**",
-            {"word": target, "result": "win", "attempts": attempt_number, "points": pts,
-             "bonus_words": len(st.session_state[KEY_BONUS_WORDS])})
+    resolve_pending()
+    checked = engine.check_guess(game, raw_guess)
+    if checked is None:
         return
-
-    # ── Case 2: already found this bonus word ──
-    if guess in bonus_words:
-        st.session_state[KEY_FEEDBACK] = ("warning", f"You already found **{guess}** as a bonus word!")
-        st.session_state[KEY_GUESS_KEY] += 1
+    guess, solved, traceable = checked
+
+    lookup = needs_lookup(guess, solved, traceable)
+    if ASYNC_CHECKS and (lookup or game.pending):
+        # Guesses are judged in the order they were made, so this one also
+        # waits behind any check still in flight
+        future = load_executor().submit(is_real_word, guess) if lookup else None
+        game.pending.append((guess, solved, traceable, future, submitted))
+        game.feedback = ("info", f"⏳ Checking **{guess}**…")
         return
+    judge_guess(guess, solved, traceable, submitted=submitted)
 
-    # ── Case 3: traceable on board + real English word → bonus! ──
-    if word_exists(board, guess) and is_real_word(guess):
-        bonus_pts = 1
-        st.session_state[KEY_TOTAL_SCORE] += bonus_pts
-        bonus_words.add(guess)
-        st.session_state[KEY_BONUS_WORDS]  = bonus_words
-        st.session_state[KEY_GUESS_KEY]   += 1
-        st.session_state[KEY_FEEDBACK] = (
-            "bonus",
-            f"🌟 Bonus word! **{guess}** is a real word on the board — **+{bonus_pts} pt!** "
-            f"Keep going to find the target word."
-        )
-        return
 
-    # ── Case 4: wrong — consume an attempt ──
-    st.session_state[KEY_ATTEMPTS]  += 1
-    st.session_state[KEY_GUESS_KEY] += 1
-    attempt_number = st.session_state[KEY_ATTEMPTS]
-
-    if attempt_number >= MAX_ATTEMPTS:
-        go_result("loss",
-            f"💀 Out of attempts! The word was **{target}**.",
-            {"word": target, "result": "loss", "attempts": attempt_number, "points": 0,
-             "bonus_words": len(st.session_state[KEY_BONUS_WORDS])})
-    elif word_exists(board, guess):
-        st.session_state[KEY_FEEDBACK] = ("error", "That word is traceable but isn't a real English word or isn't the target!")
-    else:
-        st.session_state[KEY_FEEDBACK] = ("error", "Word can't be traced on the board. Try again!")
+EVENT_KINDS = {"win": "win", "duplicate_bonus": "duplicate", "bonus": "bonus", "miss": "miss"}
 
 
-# ---------------------------
-# Handle tile click actions (runs before render)
-# ---------------------------
-def handle_tile_click(r, c):
-    sel = st.session_state[KEY_SELECTED]
+def judge_guess(guess, solved, traceable, real=None, submitted=None):
+    """Score a checked guess; real is the dictionary answer if it was looked up in the background.
 
-    # If this cell is the last selected → deselect (toggle tip)
-    if sel and sel[-1] == (r, c):
-        st.session_state[KEY_SELECTED] = sel[:-1]
-        st.session_state[KEY_FEEDBACK] = None
-        return
+    submitted is the perf_counter() time the guess was made, for the event log.
+    """
+    game = game_state()
+    score = game.total_score
+    is_real = is_real_word if real is None else (lambda _: real)
+    outcome = engine.judge_guess(game, guess, solved, traceable, is_real)
+    kind = "loss" if outcome == "miss" and game.stage == "result" else EVENT_KINDS[outcome]
+    latency_ms = (time.perf_counter() - submitted) * 1e3 if submitted is not None else 0.0
+    log_event(kind, game.total_score - score, latency_ms)
+    if game.stage == "result":
+        # Buffered; written to the leaderboard in batches by its flush thread
+        load_leaderboard().submit(game.player_id, game.player_name, game.total_score)
+    return outcome
 
-    # Already in sequence but not the tip → ignore
-    if (r, c) in sel:
-        return
 
-    # First cell or adjacent to tip → add
-    if not sel or is_adjacent(sel[-1][0], sel[-1][1], r, c):
-        new_sel = sel + [(r, c)]
-        st.session_state[KEY_SELECTED] = new_sel
-        st.session_state[KEY_FEEDBACK] = None
-
-        # Auto-submit when word length reached
-        clue_len = st.session_state[KEY_CLUE].get("length", 0)
-        if len(new_sel) == clue_len:
-            word = "".join(st.session_state[KEY_BOARD][rr][cc] for rr, cc in new_sel)
-            evaluate_guess(word)
+def resolve_pending():
+    """Judge queued guesses whose checks have finished, oldest first; returns how many."""
+    game = game_state()
+    judged = 0
+    while game.pending and game.stage == "game":
+        guess, solved, traceable, future, submitted = game.pending[0]
+        if future is not None and not future.done():
+            break
+        game.pending.pop(0)
+        judge_guess(guess, solved, traceable, future.result() if future is not None else None, submitted)
+        judged += 1
+    return judged
 
 
 # ---------------------------
-# CSS — tile board styled entirely in Streamlit buttons
+# Handle tile click actions (runs before render)
 # ---------------------------
-st.markdown("""
-<style>
-  /* ── Keyframe animations ── */
-  @keyframes fadeSlideDown {
-    from { opacity: 0; transform: translateY(-18px); }
-    to   { opacity: 1; transform: translateY(0); }
-  }
-  @keyframes fadeSlideUp {
-    from { opacity: 0; transform: translateY(14px); }
-    to   { opacity: 1; transform: translateY(0); }
-  }
-  @keyframes pulse {
-    0%, 100% { transform: scale(1); }
-    50%       { transform: scale(1.06); }
-  }
-  @keyframes popIn {
-    0%   { opacity: 0; transform: scale(0.6); }
-    70%  { transform: scale(1.12); }
-    100% { opacity: 1; transform: scale(1); }
-  }
-  @keyframes shimmer {
-    0%   { background-position: -400px 0; }
-    100% { background-position: 400px 0; }
-  }
-  @keyframes bounceIn {
-    0%   { opacity: 0; transform: scale(0.3); }
-    50%  { opacity: 1; transform: scale(1.08); }
-    70%  { transform: scale(0.95); }
-    100% { transform: scale(1); }
-  }
-  @keyframes starBurst {
-    0%   { opacity: 0; transform: scale(0) rotate(-15deg); }
-    60%  { opacity: 1; transform: scale(1.2) rotate(5deg); }
-    100% { transform: scale(1) rotate(0deg); }
-  }
-  @keyframes circlesPop {
-    0%   { letter-spacing: 2px; opacity: 0.4; }
-    50%  { letter-spacing: 10px; opacity: 1; }
-    100% { letter-spacing: 6px; opacity: 1; }
-  }
-  @keyframes softGlow {
-    0%, 100% { box-shadow: 0 0 0px rgba(79,134,247,0); }
-    50%       { box-shadow: 0 0 14px rgba(79,134,247,0.55); }
-  }
-
-  /* ── Title: drops in on load ── */
-  .big-title {
-    font-size: clamp(28px,8vw,48px); font-weight:800; text-align:center; margin-bottom:0.2em;
-    animation: fadeSlideDown 0.55s cubic-bezier(0.22,1,0.36,1) both;
-  }
-
-  /* ── Clue box: slides up with slight delay ── */
-  .clue-box {
-    background:#f0f4ff; border-radius:10px; padding:12px 18px; margin-bottom:0.6rem;
-    font-size:clamp(14px,4vw,16px);
-    animation: fadeSlideUp 0.45s 0.15s cubic-bezier(0.22,1,0.36,1) both;
-  }
-
-  /* ── Bonus clue: pops in to draw attention ── */
-  .bonus-clue-box {
-    background:#fffbe6; border:1px solid #f6d860; border-radius:10px;
-    padding:10px 16px; margin-bottom:0.6rem; font-size:clamp(13px,3.8vw,15px);
-    animation: popIn 0.4s cubic-bezier(0.22,1,0.36,1) both;
-  }
-
-  /* ── Attempt circles: animate in with stagger via circlesPop ── */
-  .attempt-bar {
-    text-align:center; font-size:15px; color:#444; margin-bottom:0.4rem;
-    animation: circlesPop 0.5s 0.2s ease both;
-  }
-
-  /* ── Score: pulses gently to feel alive ── */
-  .total-score {
-    font-size:clamp(20px,6vw,28px); font-weight:800; text-align:center;
-    color:#4CAF50; margin:0.5rem 0 1rem 0;
-    animation: pulse 2.5s ease-in-out infinite;
-  }
-
-  /* ── History rows: staggered slide up ── */
-  .history-row {
-    font-size:clamp(13px,3.5vw,15px); padding:4px 0;
-    animation: fadeSlideUp 0.35s ease both;
-  }
-
-  /* ── Word display: bounces in when letters appear ── */
-  .word-display {
-    text-align:center; font-size:clamp(20px,6vw,26px); font-weight:800;
-    letter-spacing:8px; min-height:38px; margin-bottom:6px;
-    animation: bounceIn 0.4s cubic-bezier(0.22,1,0.36,1) both;
-  }
-
-  /* ── Subscribe wall icon: star burst ── */
-  .subscribe-icon {
-    animation: starBurst 0.6s cubic-bezier(0.22,1,0.36,1) both;
-    display: inline-block;
-  }
-
-  /* ── Board wrapper ── */
-  .board-wrapper {
-    max-width: 240px;
-    margin: 0 auto 6px auto;
-    animation: fadeSlideUp 0.4s 0.1s ease both;
-  }
-
-  /* ── Tile buttons ── */
-  .board-wrapper div[data-testid="stButton"] > button {
-    width: 100% !important;
-    aspect-ratio: 1 / 1 !important;
-    font-size: 20px !important;
-    font-weight: 800 !important;
-    border-radius: 8px !important;
-    border: 2px solid #ddd !important;
-    background: #f9f9f9 !important;
-    color: #222 !important;
-    padding: 0 !important;
-    /* Extended transition covers color, border, transform AND box-shadow */
-    transition: background 0.15s, border-color 0.15s, transform 0.12s, box-shadow 0.15s !important;
-    line-height: 1 !important;
-    min-height: unset !important;
-  }
-  .board-wrapper div[data-testid="stButton"] > button:hover {
-    border-color: #888 !important;
-    transform: scale(1.08) !important;
-    box-shadow: 0 4px 12px rgba(0,0,0,0.13) !important;
-  }
-  .board-wrapper div[data-testid="stButton"] > button:active {
-    transform: scale(0.94) !important;
-  }
-
-  /* Selected tile — glows softly */
-  .board-wrapper div[data-testid="stButton"].tile-selected > button {
-    background: #4f86f7 !important;
-    border-color: #1a56db !important;
-    color: white !important;
-    animation: softGlow 1.8s ease-in-out infinite !important;
-  }
-
-  /* Tip tile (last selected) — pops and glows stronger */
-  .board-wrapper div[data-testid="stButton"].tile-tip > button {
-    background: #1a56db !important;
-    border-color: #0d3b9e !important;
-    color: white !important;
-    transform: scale(1.09) !important;
-    box-shadow: 0 0 18px rgba(26,86,219,0.5) !important;
-  }
-
-  /* Blocked tile */
-  .board-wrapper div[data-testid="stButton"].tile-blocked > button {
-    opacity: 0.28 !important;
-    cursor: not-allowed !important;
-    pointer-events: none !important;
-    transform: none !important;
-  }
-</style>
-""", unsafe_allow_html=True)
-
-
-# ==============================
-# STAGE 1 — HOME
-# ==============================
-if st.session_state[KEY_STAGE] == "home":
-
-    st.markdown('<div class="big-title">Project Clue</div>', unsafe_allow_html=True)
-    st.markdown('<div style="text-align:center;color:#666;margin-bottom:1.5em;font-size:clamp(14px,4vw,18px);">A word tracing puzzle game</div>', unsafe_allow_html=True)
-
-    st.markdown("### How to play")
-    st.markdown(
-        f"1. A **4×4 grid** of letters appears — **tap letters** to build your word.\n"
-        f"2. Each letter must be **adjacent** to the previous (up/down/left/right). No reusing cells.\n"
-        f"3. **Tap the last selected letter again** to deselect it.\n"
-        f"4. The word **auto-submits** when you reach the correct letter count.\n"
-        f"5. You have **{MAX_ATTEMPTS} attempts** per word.\n"
-        f"6. **Bonus clues appear automatically after each wrong guess:**\n"
-        f"   - ❌ After attempt 1 → **starting letter** revealed.\n"
-        f"   - ❌ After attempt 2 → **a middle letter & position** revealed.\n"
-        f"7. **Scoring:** Attempt 1 = **10 pts** · Attempt 2 = **5 pts** · Attempt 3 = **3 pts**.\n"
-        f"8. This demo includes **{DEMO_LIMIT} words**. Subscribe to keep playing!"
-    )
+def handle_tile_click(i):
+    game = game_state()
+    if not game.toggle(i):
+        return
+    game.feedback = None
 
-    st.write("")
-    if st.button("▶️ Start Game", use_container_width=True):
-        start_new_game()
-        st.rerun()
+    # Auto-submit when word length reached
+    if len(game.path) == game.clue.get("length", 0):
+        evaluate_guess(game.selected_word())
+        # Attempts, score or stage may have changed outside the board fragment
+        game.rerun_app = True
 
-    if st.session_state[KEY_HISTORY]:
-        st.divider()
-        wins  = sum(1 for h in st.session_state[KEY_HISTORY] if h["result"] == "win")
-        total = len(st.session_state[KEY_HISTORY])
-        st.markdown(f"**Session record:** {wins}W / {total-wins}L")
-        st.markdown(f'<div class="total-score">🏆 {st.session_state[KEY_TOTAL_SCORE]} pts</div>', unsafe_allow_html=True)
 
+def clear_selection():
+    game = game_state()
+    game.clear_selection()
+    game.feedback = None
 
-# ==============================
-# STAGE 2 — GAME
-# ==============================
-elif st.session_state[KEY_STAGE] == "game":
 
-    clue     = st.session_state[KEY_CLUE]
-    attempts = st.session_state[KEY_ATTEMPTS]
-    target   = st.session_state[KEY_TARGET_WORD]
-    board    = st.session_state[KEY_BOARD]
-    played   = st.session_state[KEY_WORDS_PLAYED]
-    sel      = st.session_state[KEY_SELECTED]
+def handle_board_submit(path):
+    """Evaluate the path the board component sent (cell indexes, row-major)."""
+    game = game_state()
+    guess_key = game.guess_key
+    game.feedback = None
+    if isinstance(path, list) and game.is_path(path):
+        evaluate_guess("".join(game.letter(i) for i in path))
+    else:
+        # Not a path the board lets you trace (crafted value): judge nothing
+        game.feedback = ("error", "Word can't be traced on the board. Try again!")
+    # Always retire this component instance so its value is never handled twice
+    if game.guess_key == guess_key:
+        game.guess_key += 1
 
-    st.markdown('<div class="big-title">Project Clue</div>', unsafe_allow_html=True)
-    st.markdown(
-        f'<div style="text-align:center;color:#888;font-size:13px;margin-bottom:0.4rem;">'
-        f'Word {played+1} of {DEMO_LIMIT}</div>',
-        unsafe_allow_html=True
-    )
 
-    # Clues
-    st.markdown(
-        f'<div class="clue-box">🔤 <b>Length:</b> {clue["length"]} &nbsp;|&nbsp; 📂 <b>Category:</b> {clue["category"]}</div>',
-        unsafe_allow_html=True
-    )
-    for bc in get_bonus_clues(target, attempts):
-        st.markdown(f'<div class="bonus-clue-box">{bc}</div>', unsafe_allow_html=True)
+# ---------------------------
+# Game board panel — reruns on its own when tiles change
+# ---------------------------
+@st.fragment
+@metrics.timed("fragment", fragment="board_panel")
+def board_panel():
+    """Feedback, bonus words, word display and tile board for the game stage.
+
+    Runs as a fragment: selecting or deselecting a tile reruns only this panel.
+    Tile callbacks that submit a guess set game.rerun_app, and the panel then
+    hands over to a full rerun so attempts, clues, score and stage refresh.
+    """
+    game = game_state()
+    if game.rerun_app:
+        game.rerun_app = False
+        st.rerun()
 
-    remaining = MAX_ATTEMPTS - attempts
-    circles   = "🟢" * remaining + "🔴" * attempts
-    pts_next  = SCORE_MAP.get(attempts + 1, 0)
-    st.markdown(
-        f'<div class="attempt-bar">{circles} &nbsp; {attempts}/{MAX_ATTEMPTS} used'
-        f' &nbsp;|&nbsp; Next correct = <b>{pts_next} pts</b></div>',
-        unsafe_allow_html=True
-    )
-    st.markdown(
-        f'<div style="text-align:center;color:#4CAF50;font-weight:700;margin-bottom:0.2rem;">'
-        f'🏆 Score: {st.session_state[KEY_TOTAL_SCORE]} pts</div>',
-        unsafe_allow_html=True
-    )
+    clue = game.clue
 
     # Feedback
-    fb = st.session_state[KEY_FEEDBACK]
+    fb = game.feedback
     if fb:
         if fb[0] == "warning":   st.warning(fb[1])
         elif fb[0] == "bonus":   st.success(fb[1])
+        elif fb[0] == "info":    st.info(fb[1])
         else:                    st.error(fb[1])
 
     # Show bonus words found this round
-    bonus_words = st.session_state[KEY_BONUS_WORDS]
+    bonus_words = game.bonus_words
+    bonus_total = bonus_word_total(game)
     if bonus_words:
         bw_list = "  ·  ".join(sorted(bonus_words))
         st.markdown(
             f'<div style="text-align:center;font-size:13px;color:#7c3aed;margin-bottom:0.3rem;">'
-            f'🌟 Bonus words found: <b>{bw_list}</b></div>',
+            f'🌟 Bonus words found ({len(bonus_words)}/{bonus_total}): <b>{bw_list}</b></div>',
+            unsafe_allow_html=True
+        )
+    elif bonus_total:
+        st.markdown(
+            f'<div style="text-align:center;font-size:13px;color:#7c3aed;margin-bottom:0.3rem;">'
+            f'🌟 {bonus_total} bonus word{"s" if bonus_total != 1 else ""} hidden on this board</div>',
             unsafe_allow_html=True
         )
 
-    # ── Word being built display ──
-    if sel:
-        w = "".join(board[r][c] for r, c in sel)
-        color = "#16a34a" if len(sel) == clue["length"] else "#1a56db"
+    if CLIENT_BOARD:
+        # ── Tile board as a browser-side component ──
+        # Selection, adjacency blocking and deselecting the tip all happen in the
+        # browser; the server only hears about a finished word, and re-checks its path.
+        value = board_component(
+            cells=game.flat, size=BOARD_SIZE, length=clue["length"],
+            round=game.guess_key, key=f"board_{game.guess_key}",
+        )
+        if value:
+            handle_board_submit(value["path"])
+            st.rerun()
     else:
-        w = ""
-        color = "#bbb"
+        # ── Word being built display ──
+        w = game.selected_word()
+        if w:
+            color = "#16a34a" if len(w) == clue["length"] else "#1a56db"
+        else:
+            color = "#bbb"
+        st.markdown(
+            f'<div class="word-display" style="color:{color};">'
+            f'{" · ".join(list(w)) if w else "· · ·"}</div>',
+            unsafe_allow_html=True
+        )
+
+        # ── Tile board using st.columns + st.button ──
+        # Each cell is a native Streamlit button. Tile state is carried by the
+        # button itself (tip = primary, selected = tertiary, blocked = disabled)
+        # and styled by the .st-key-tile_board CSS rules.
+        with st.container(key="tile_board"):
+            for row_idx in range(BOARD_SIZE):
+                cols = st.columns(BOARD_SIZE)
+                for col_idx in range(BOARD_SIZE):
+                    i = row_idx * BOARD_SIZE + col_idx
+                    with cols[col_idx]:
+                        btn_key = f"tile_{row_idx}_{col_idx}_{game.guess_key}"
+                        st.button(
+                            game.letter(i), key=btn_key, use_container_width=True,
+                            type="primary" if game.is_tip(i) else "tertiary" if game.is_selected(i) else "secondary",
+                            disabled=game.is_blocked(i),
+                            on_click=handle_tile_click, args=(i,),
+                        )
+
+        # Clear button
+        st.write("")
+        if game.path:
+            st.button("✖ Clear selection", use_container_width=True, on_click=clear_selection)
+
+
+game = game_state()
+if st.query_params.get("session") != game.resume_token:
+    st.query_params["session"] = game.resume_token  # the secret, never the public player id
+
+# ---------------------------
+# Background dictionary checks — polled while any are in flight
+# ---------------------------
+@st.fragment(run_every=CHECK_POLL_SECONDS)
+@metrics.timed("fragment", fragment="pending_checks")
+def pending_checks():
+    """Judge guesses whose background checks finished, then rerun the app to show the result.
+
+    Only rendered while game.pending is non-empty, so the polling stops with it.
+    """
+    if resolve_pending():
+        st.rerun()
+    words = [guess for guess, *_ in game_state().pending]
+    st.caption(f"⏳ Checking {', '.join(words)}…")
+
+
+# ---------------------------
+# Static assets — CSS (assets/clue.css) and confetti JS, once per browser session
+# ---------------------------
+if not game.assets_sent:
+    # Same-origin srcdoc frame, so its script can reach window.parent; 1px, the smallest height st.iframe takes
+    st.iframe(loader_html(), height=1)
+    game.assets_sent = True
+
+
+# ---------------------------
+# Global leaderboard — top rows and this session's rank, from the shared cache
+# ---------------------------
+def leaderboard_panel():
+    board = load_leaderboard()
+    rank, players = board.rank(game.total_score)
+    rows = "".join(
+        f'<div class="history-row">{n}. {name} — <b>{score} pts</b></div>'
+        for n, (name, score) in enumerate(board.top(LEADERBOARD_TOP), 1)
+    )
+    st.markdown("### 🌍 Global Leaderboard")
     st.markdown(
-        f'<div class="word-display" style="color:{color};">'
-        f'{" · ".join(list(w)) if w else "· · ·"}</div>',
+        f'{rows}<div style="color:#888;font-size:13px;margin-top:0.3rem;">'
+        f'You ({game.player_name}) are #{rank} of {players}</div>',
         unsafe_allow_html=True
     )
 
-    # ── Tile board using st.columns + st.button ──
-    # Each cell is a native Streamlit button — no iframe, no bridge needed.
-    # We inject a JS snippet AFTER rendering to add CSS classes to selected/tip/blocked buttons.
-    st.markdown('<div class="board-wrapper">', unsafe_allow_html=True)
-    for row_idx in range(BOARD_SIZE):
-        cols = st.columns(BOARD_SIZE)
-        for col_idx in range(BOARD_SIZE):
-            cell_letter = board[row_idx][col_idx]
-            pos_in_sel  = sel.index((row_idx, col_idx)) if (row_idx, col_idx) in sel else -1
-            is_in_sel   = pos_in_sel != -1
-            is_tip      = sel and sel[-1] == (row_idx, col_idx)
-            adj_to_tip  = sel and is_adjacent(sel[-1][0], sel[-1][1], row_idx, col_idx)
-            can_add     = not is_in_sel and (not sel or adj_to_tip)
-
-            # Build label: letter + small seq number superscript for selected cells
-            if is_tip:
-                label = f"{cell_letter}"
-            elif is_in_sel:
-                label = f"{cell_letter}"
-            else:
-                label = cell_letter
-
-            with cols[col_idx]:
-                btn_key = f"tile_{row_idx}_{col_idx}_{st.session_state[KEY_GUESS_KEY]}"
-                clicked = st.button(label, key=btn_key, use_container_width=True)
-
-            if clicked:
-                handle_tile_click(row_idx, col_idx)
-                st.rerun()
 
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    # ── CSS class injection via JS to style selected/tip/blocked tiles ──
-    # We mark each button by its position so JS can find and style it.
-    sel_indices = [(r * BOARD_SIZE + c) for r, c in sel]
-    tip_index   = (sel[-1][0] * BOARD_SIZE + sel[-1][1]) if sel else -1
-
-    # Blocked = in grid but not selectable (not adjacent to tip, not already selected)
-    blocked_indices = []
-    if sel:
-        last_r, last_c = sel[-1]
-        for ri in range(BOARD_SIZE):
-            for ci in range(BOARD_SIZE):
-                idx = ri * BOARD_SIZE + ci
-                in_s = (ri, ci) in sel
-                adj  = is_adjacent(last_r, last_c, ri, ci)
-                if not in_s and not adj:
-                    blocked_indices.append(idx)
-
-    st.markdown(f"""
-    <script>
-    (function() {{
-      // Give Streamlit a moment to render the buttons
-      setTimeout(() => {{
-        const btns = window.parent.document.querySelectorAll(
-          '.board-wrapper div[data-testid="stButton"] button'
-        );
-        const sel     = {sel_indices};
-        const tip     = {tip_index};
-        const blocked = {blocked_indices};
-        const size    = {BOARD_SIZE};
-
-        let tileBtns = Array.from(btns);
-
-        tileBtns.forEach((btn, i) => {{
-          const parent = btn.parentElement;
-          parent.classList.remove('tile-selected','tile-tip','tile-blocked');
-          if (i === tip) {{
-            parent.classList.add('tile-tip');
-          }} else if (sel.includes(i)) {{
-            parent.classList.add('tile-selected');
-          }} else if (blocked.includes(i)) {{
-            parent.classList.add('tile-blocked');
-          }}
-        }});
-      }}, 80);
-    }})();
-    </script>
-    """, unsafe_allow_html=True)
-
-    # Clear button
-    st.write("")
-    if sel:
-        if st.button("✖ Clear selection", use_container_width=True):
-            st.session_state[KEY_SELECTED] = []
-            st.session_state[KEY_FEEDBACK] = None
+# ---------------------------
+# Session history — one table element showing one page, newest first
+# ---------------------------
+def history_table(history):
+    """Render a page of history as a single dataframe; cost is bounded by HISTORY_PAGE, not len(history)."""
+    total = len(history)
+    pages = max(1, -(-total // HISTORY_PAGE))
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key="history_page")
+    newest = total - (page - 1) * HISTORY_PAGE
+    rows = [
+        {"#": n, "Word": h["word"], "Result": "✅" if h["result"] == "win" else "❌",
+         "Attempt": h["attempts"], "Points": h.get("points", 0), "Bonus": h.get("bonus_words", 0)}
+        for n, h in zip(range(newest, 0, -1), reversed(history[max(0, newest - HISTORY_PAGE):newest]))
+    ]
+    st.dataframe(rows, hide_index=True, use_container_width=True)
+
+
+# ---------------------------
+# Stage rendering — timed per stage when metrics are on
+# ---------------------------
+with metrics.timer("rerun", stage=game.stage):
+
+    # ==============================
+    # STAGE 1 — HOME
+    # ==============================
+    if game.stage == "home":
+
+        st.markdown('<div class="big-title">Project Clue</div>', unsafe_allow_html=True)
+        st.markdown('<div style="text-align:center;color:#666;margin-bottom:1.5em;font-size:clamp(14px,4vw,18px);">A word tracing puzzle game</div>', unsafe_allow_html=True)
+
+        st.markdown("### How to play")
+        st.markdown(
+            f"1. A **4×4 grid** of letters appears — **tap letters** to build your word.\n"
+            f"2. Each letter must be **adjacent** to the previous (up/down/left/right). No reusing cells.\n"
+            f"3. **Tap the last selected letter again** to deselect it.\n"
+            f"4. The word **auto-submits** when you reach the correct letter count.\n"
+            f"5. You have **{MAX_ATTEMPTS} attempts** per word.\n"
+            f"6. **Bonus clues appear automatically after each wrong guess:**\n"
+            f"   - ❌ After attempt 1 → **starting letter** revealed.\n"
+            f"   - ❌ After attempt 2 → **a middle letter & position** revealed.\n"
+            f"7. **Scoring:** Attempt 1 = **10 pts** · Attempt 2 = **5 pts** · Attempt 3 = **3 pts**.\n"
+            f"8. This demo includes **{DEMO_LIMIT} words**. Subscribe to keep playing!"
+        )
+
+        st.write("")
+        if st.button("▶️ Start Game", use_container_width=True):
+            start_new_game()
+            st.rerun()
+        if st.button("📅 Daily Puzzle", use_container_width=True, disabled=game.daily == today(),
+                     help="Played today — come back tomorrow!" if game.daily == today() else None):
+            start_daily_game()
             st.rerun()
 
-    st.caption("💡 Tap the last selected letter to deselect. Word auto-submits when complete.")
+        if game.history:
+            st.divider()
+            st.markdown(f"**Session record:** {game.wins}W / {game.losses}L")
+            st.markdown(f'<div class="total-score">🏆 {game.total_score} pts</div>', unsafe_allow_html=True)
 
-    if st.button("🏠 Back to Home", use_container_width=True):
-        go_home()
-        st.rerun()
 
+    # ==============================
+    # STAGE 2 — GAME
+    # ==============================
+    elif game.stage == "game":
 
-# ==============================
-# STAGE 3 — RESULT
-# ==============================
-elif st.session_state[KEY_STAGE] == "result":
+        clue     = game.clue
+        attempts = game.attempts
+        target   = game.target
+        played   = game.words_played
 
-    st.markdown('<div class="big-title">Project Clue</div>', unsafe_allow_html=True)
+        st.markdown('<div class="big-title">Project Clue</div>', unsafe_allow_html=True)
+        st.markdown(
+            f'<div style="text-align:center;color:#888;font-size:13px;margin-bottom:0.4rem;">'
+            f'Word {played+1} of {DEMO_LIMIT}</div>',
+            unsafe_allow_html=True
+        )
 
-    msg = st.session_state[KEY_LAST_MSG]
-    # Confetti burst on win
-    if msg and msg[0] == "win":
-        st.markdown("""
-        <div id="confetti-container" style="position:fixed;top:0;left:0;width:100%;height:100%;pointer-events:none;z-index:9999;overflow:hidden;"></div>
-        <script>
-        (function() {
-          const container = window.parent.document.getElementById('confetti-container')
-                         || document.getElementById('confetti-container');
-          if (!container || container.dataset.fired) return;
-          container.dataset.fired = '1';
-          const colors = ['#4f86f7','#4CAF50','#f59e0b','#ef4444','#8b5cf6','#ec4899','#06b6d4'];
-          for (let i = 0; i < 120; i++) {
-            const el = document.createElement('div');
-            const size = Math.random() * 10 + 6;
-            const color = colors[Math.floor(Math.random() * colors.length)];
-            const left = Math.random() * 100;
-            const delay = Math.random() * 0.8;
-            const duration = Math.random() * 2 + 1.5;
-            const rotate = Math.random() * 720;
-            el.style.cssText = `
-              position:absolute; top:-20px; left:${left}%;
-              width:${size}px; height:${size * (Math.random() > 0.5 ? 1 : 2.5)}px;
-              background:${color}; border-radius:${Math.random() > 0.5 ? '50%' : '2px'};
-              animation: confettiFall ${duration}s ${delay}s ease-in forwards;
-              opacity: 0.9;
-            `;
-            container.appendChild(el);
-          }
-          const style = document.createElement('style');
-          style.textContent = `
-            @keyframes confettiFall {
-              0%   { transform: translateY(0) rotate(0deg); opacity: 0.9; }
-              100% { transform: translateY(110vh) rotate(${Math.random()*720}deg); opacity: 0; }
-            }
-          `;
-          (window.parent.document.head || document.head).appendChild(style);
-          setTimeout(() => { container.innerHTML = ''; }, 4000);
-        })();
-        </script>
-        """, unsafe_allow_html=True)
-    if msg:
-        if msg[0] == "win": st.success(msg[1])
-        else: st.error(msg[1])
+        # Clues
+        st.markdown(
+            f'<div class="clue-box">🔤 <b>Length:</b> {clue["length"]} &nbsp;|&nbsp; 📂 <b>Category:</b> {clue["category"]}</div>',
+            unsafe_allow_html=True
+        )
+        for bc in get_bonus_clues(target, attempts):
+            st.markdown(f'<div class="bonus-clue-box">{bc}</div>', unsafe_allow_html=True)
 
-    st.markdown(
-        f'<div class="total-score">🏆 Total Score: {st.session_state[KEY_TOTAL_SCORE]} pts</div>',
-        unsafe_allow_html=True
-    )
+        remaining = MAX_ATTEMPTS - attempts
+        circles   = "🟢" * remaining + "🔴" * attempts
+        pts_next  = SCORE_MAP.get(attempts + 1, 0)
+        st.markdown(
+            f'<div class="attempt-bar">{circles} &nbsp; {attempts}/{MAX_ATTEMPTS} used'
+            f' &nbsp;|&nbsp; Next correct = <b>{pts_next} pts</b></div>',
+            unsafe_allow_html=True
+        )
+        st.markdown(
+            f'<div style="text-align:center;color:#4CAF50;font-weight:700;margin-bottom:0.2rem;">'
+            f'🏆 Score: {game.total_score} pts</div>',
+            unsafe_allow_html=True
+        )
+
+        board_panel()
+        if game.pending:
+            pending_checks()
+
+        st.caption("💡 Tap the last selected letter to deselect. Word auto-submits when complete.")
 
-    if st.session_state[KEY_WORDS_PLAYED] >= DEMO_LIMIT:
-        st.info(f"You've completed all {DEMO_LIMIT} demo words!")
-        if st.button("🔔 Subscribe to Continue", use_container_width=True):
-            st.session_state[KEY_STAGE] = "subscribe"
-            st.rerun()
         if st.button("🏠 Back to Home", use_container_width=True):
             go_home()
             st.rerun()
-    else:
-        st.markdown("### Continue playing?")
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("▶️ Next Word", use_container_width=True):
-                start_new_game()
-                st.rerun()
-        with col2:
-            if st.button("🏠 End Session", use_container_width=True):
-                go_home()
-                st.rerun()
 
-    st.divider()
-    st.markdown("### 📊 Session History")
-    history = st.session_state[KEY_HISTORY]
-    wins  = sum(1 for h in history if h["result"] == "win")
-    total = len(history)
-    st.markdown(f"**{wins} wins / {total-wins} losses** across {total} words")
-    st.write("")
-    for i, h in enumerate(reversed(history), 1):
-        icon      = "✅" if h["result"] == "win" else "❌"
-        pts       = h.get("points", 0)
-        pts_label = f" · **+{pts} pts**" if pts > 0 else " · *0 pts*"
-        bw = h.get("bonus_words", 0)
-        bw_label = f" · 🌟 {bw} bonus" if bw else ""
+
+    # ==============================
+    # STAGE 3 — RESULT
+    # ==============================
+    elif game.stage == "result":
+
+        st.markdown('<div class="big-title">Project Clue</div>', unsafe_allow_html=True)
+
+        msg = game.last_msg
+        # Confetti burst on win — the script itself was installed with the assets
+        if game.confetti:
+            st.iframe(CONFETTI_TRIGGER, height=1)
+            game.confetti = False
+        if msg:
+            if msg[0] == "win": st.success(msg[1])
+            else: st.error(msg[1])
+
         st.markdown(
-            f'<div class="history-row">{icon} Word {total-i+1}: '
-            f'<code>{h["word"]}</code> — attempt {h["attempts"]}{pts_label}{bw_label}</div>',
+            f'<div class="total-score">🏆 Total Score: {game.total_score} pts</div>',
             unsafe_allow_html=True
         )
+        leaderboard_panel()
+
+        if game.words_played >= DEMO_LIMIT:
+            st.info(f"You've completed all {DEMO_LIMIT} demo words!")
+            if st.button("🔔 Subscribe to Continue", use_container_width=True):
+                game.stage = "subscribe"
+                st.rerun()
+            if st.button("🏠 Back to Home", use_container_width=True):
+                go_home()
+                st.rerun()
+        else:
+            st.markdown("### Continue playing?")
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("▶️ Next Word", use_container_width=True):
+                    start_new_game()
+                    st.rerun()
+            with col2:
+                if st.button("🏠 End Session", use_container_width=True):
+                    go_home()
+                    st.rerun()
 
+        st.divider()
+        st.markdown("### 📊 Session History")
+        total = len(game.history)
+        st.markdown(f"**{game.wins} wins / {game.losses} losses** across {total} words")
+        history_table(game.history)
 
-# ==============================
-# STAGE 4 — SUBSCRIBE WALL
-# ==============================
-elif st.session_state[KEY_STAGE] == "subscribe":
 
-    st.markdown('<div class="big-title">Project Clue</div>', unsafe_allow_html=True)
-    st.markdown("""
-    <div style="text-align:center;padding:2rem 1rem;">
-      <div class="subscribe-icon" style="font-size:64px;">🔒</div>
-      <h2 style="font-size:clamp(22px,6vw,34px);font-weight:800;margin:0.5rem 0;">Thanks for playing!</h2>
-      <p style="color:#555;font-size:clamp(14px,4vw,18px);margin-bottom:1.5rem;">
-        You've completed all 3 free words.<br>
-        Subscribe to unlock unlimited words, more categories, and a global leaderboard.
-      </p>
-    </div>
-    """, unsafe_allow_html=True)
+    # ==============================
+    # STAGE 4 — SUBSCRIBE WALL
+    # ==============================
+    elif game.stage == "subscribe":
 
-    st.markdown(
-        f'<div class="total-score">🏆 Your demo score: {st.session_state[KEY_TOTAL_SCORE]} pts</div>',
-        unsafe_allow_html=True
-    )
+        st.markdown('<div class="big-title">Project Clue</div>', unsafe_allow_html=True)
+        st.markdown("""
+        <div style="text-align:center;padding:2rem 1rem;">
+          <div class="subscribe-icon" style="font-size:64px;">🔒</div>
+          <h2 style="font-size:clamp(22px,6vw,34px);font-weight:800;margin:0.5rem 0;">Thanks for playing!</h2>
+          <p style="color:#555;font-size:clamp(14px,4vw,18px);margin-bottom:1.5rem;">
+            You've completed all 3 free words.<br>
+            Subscribe to unlock unlimited words, more categories, and a global leaderboard.
+          </p>
+        </div>
+        """, unsafe_allow_html=True)
 
-    # ← Replace with your real subscribe link
-    st.markdown("""
-    <div style="text-align:center;margin:1rem 0 0.5rem 0;">
-      <a href="https://your-subscribe-link.com" target="_blank"
-         style="display:inline-block;background:#4CAF50;color:white;
-                font-weight:700;font-size:18px;padding:14px 32px;
-                border-radius:10px;text-decoration:none;">
-        🔔 Subscribe to Continue Playing
-      </a>
-    </div>
-    <p style="text-align:center;color:#aaa;font-size:13px;margin-top:10px;">— End of Demo —</p>
-    """, unsafe_allow_html=True)
-
-    st.write("")
-    if st.button("🏠 Back to Home", use_container_width=True):
-        go_home()
-        st.rerun()
+        st.markdown(
+            f'<div class="total-score">🏆 Your demo score: {game.total_score} pts</div>',
+            unsafe_allow_html=True
+        )
+
+        # ← Replace with your real subscribe link
+        st.markdown("""
+        <div style="text-align:center;margin:1rem 0 0.5rem 0;">
+          <a href="https://your-subscribe-link.com" target="_blank"
+             style="display:inline-block;background:#4CAF50;color:white;
+                    font-weight:700;font-size:18px;padding:14px 32px;
+                    border-radius:10px;text-decoration:none;">
+            🔔 Subscribe to Continue Playing
+          </a>
+        </div>
+        <p style="text-align:center;color:#aaa;font-size:13px;margin-top:10px;">— End of Demo —</p>
+        """, unsafe_allow_html=True)
+
+        st.write("")
+        if st.button("🏠 Back to Home", use_container_width=True):
+            go_home()
+            st.rerun()
@@ -0,0 +1,39 @@
+"""Static CSS and JS, sent to the browser once per session.
+
+The stylesheet and the confetti script are read once per process and wrapped
+in a small loader that installs them into the parent page's <head>. They
+stay there across reruns, so later deltas only carry dynamic content.
+"""
+import json
+import os
+from functools import lru_cache
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+CONFETTI_TRIGGER = "<script>window.parent.clueConfetti && window.parent.clueConfetti();</script>"
+
+
+def _read(name):
+    with open(os.path.join(ASSET_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def loader_html():
+    """HTML for a one-pixel st.iframe frame that installs the assets into its parent."""
+    return f"""<script>
+(function() {{
+  const doc = window.parent.document;
+  if (!doc.getElementById("clue-css")) {{
+    const style = doc.createElement("style");
+    style.id = "clue-css";
+    style.textContent = {json.dumps(_read("clue.css"))};
+    doc.head.appendChild(style);
+  }}
+  if (!window.parent.clueConfetti) {{
+    const script = doc.createElement("script");
+    script.textContent = {json.dumps(_read("confetti.js"))};
+    doc.head.appendChild(script);
+  }}
+}})();
+</script>"""
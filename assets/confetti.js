@@ -0,0 +1,46 @@
+// Confetti burst for a won round. Installed once per page as
+// window.clueConfetti; the result stage only sends a call to it.
+(function () {
+  const colors = ['#4f86f7','#4CAF50','#f59e0b','#ef4444','#8b5cf6','#ec4899','#06b6d4'];
+
+  function confetti() {
+    let container = document.getElementById('confetti-container');
+    if (!container) {
+      container = document.createElement('div');
+      container.id = 'confetti-container';
+      container.style.cssText =
+        'position:fixed;top:0;left:0;width:100%;height:100%;pointer-events:none;z-index:9999;overflow:hidden;';
+      document.body.appendChild(container);
+    }
+    if (!document.getElementById('confetti-keyframes')) {
+      const style = document.createElement('style');
+      style.id = 'confetti-keyframes';
+      style.textContent = `
+        @keyframes confettiFall {
+          0%   { transform: translateY(0) rotate(0deg); opacity: 0.9; }
+          100% { transform: translateY(110vh) rotate(${Math.random()*720}deg); opacity: 0; }
+        }
+      `;
+      document.head.appendChild(style);
+    }
+    for (let i = 0; i < 120; i++) {
+      const el = document.createElement('div');
+      const size = Math.random() * 10 + 6;
+      const color = colors[Math.floor(Math.random() * colors.length)];
+      const left = Math.random() * 100;
+      const delay = Math.random() * 0.8;
+      const duration = Math.random() * 2 + 1.5;
+      el.style.cssText = `
+        position:absolute; top:-20px; left:${left}%;
+        width:${size}px; height:${size * (Math.random() > 0.5 ? 1 : 2.5)}px;
+        background:${color}; border-radius:${Math.random() > 0.5 ? '50%' : '2px'};
+        animation: confettiFall ${duration}s ${delay}s ease-in forwards;
+        opacity: 0.9;
+      `;
+      container.appendChild(el);
+    }
+    setTimeout(() => { container.innerHTML = ''; }, 4000);
+  }
+
+  window.clueConfetti = confetti;
+})();
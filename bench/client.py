@@ -0,0 +1,184 @@
+"""Minimal headless Streamlit client for benchmarks and load tests.
+
+Speaks the same websocket protocol as the browser: send a BackMsg asking for
+a rerun (optionally with a clicked widget or a fragment id), then read
+ForwardMsgs until the server reports the run finished. Each run records wall
+time, message count and bytes received.
+"""
+import asyncio
+import contextlib
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from dataclasses import dataclass, field
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+FINISHED = {
+    ForwardMsg.FINISHED_SUCCESSFULLY,
+    ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY,
+    ForwardMsg.FINISHED_WITH_COMPILE_ERROR,
+}
+
+
+@dataclass
+class Run:
+    seconds:  float
+    messages: int
+    bytes:    int
+    status:   int
+
+
+@dataclass
+class Widget:
+    id:          str
+    kind:        str
+    label:       str
+    fragment_id: str
+    args:        str = ""
+
+
+@dataclass
+class Session:
+    url:        str
+    widgets:    dict = field(default_factory=dict)   # delta path -> Widget from the latest runs
+    markdown:   list = field(default_factory=list)   # markdown bodies seen in the last run
+    exception:  str  = ""
+    ws:         object = None
+    page_hash:  str  = ""
+
+    async def connect(self, timeout=30):
+        self.ws = await websockets.connect(
+            self.url, subprotocols=["streamlit"], max_size=None, open_timeout=timeout,
+        )
+        return await self.rerun()
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def rerun(self, widget_id=None, trigger=True, json_value=None, fragment_id="", timeout=30):
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.page_script_hash = self.page_hash
+        state.fragment_id = fragment_id
+        if widget_id is not None:
+            ws = state.widget_states.widgets.add()
+            ws.id = widget_id
+            if json_value is not None:
+                ws.json_value = json_value
+            else:
+                ws.trigger_value = trigger
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        messages = size = 0
+        while True:
+            raw = await asyncio.wait_for(self.ws.recv(), timeout)
+            messages += 1
+            size += len(raw)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            kind = fwd.WhichOneof("type")
+            if kind == "new_session":
+                # Sent at the start of every script run, including ones restarted by st.rerun()
+                self.page_hash = fwd.new_session.page_script_hash
+                self.markdown, self.exception = [], ""
+                if not fwd.new_session.fragment_ids_this_run:
+                    # A full run, whoever asked for it (a fragment's st.rerun() included):
+                    # widgets from the previous run are gone
+                    self.widgets = {}
+            elif kind == "delta":
+                self._record(fwd)
+            elif kind == "script_finished" and fwd.script_finished in FINISHED:
+                return Run(time.perf_counter() - start, messages, size, fwd.script_finished)
+
+    def _record(self, fwd):
+        delta = fwd.delta
+        if delta.WhichOneof("type") != "new_element":
+            return
+        el = delta.new_element
+        path = tuple(fwd.metadata.delta_path)
+        kind = el.WhichOneof("type")
+        if kind == "button":
+            self.widgets[path] = Widget(el.button.id, kind, el.button.label, delta.fragment_id)
+        elif kind == "component_instance":
+            ci = el.component_instance
+            self.widgets[path] = Widget(ci.id, kind, ci.component_name, delta.fragment_id, ci.json_args)
+        elif kind == "markdown":
+            self.markdown.append(el.markdown.body)
+        elif kind == "exception":
+            self.exception = el.exception.message
+
+    def find(self, label=None, key=None):
+        """Return the first current widget with this label, or whose id ends with this user key."""
+        for w in self.widgets.values():
+            if (label is not None and w.label == label) or (key is not None and w.id.endswith(f"-{key}")):
+                return w
+        return None
+
+    async def click(self, label=None, key=None):
+        w = self.find(label, key)
+        if w is None:
+            raise LookupError(f"No widget with label={label!r} key={key!r}")
+        return await self.rerun(w.id, fragment_id=w.fragment_id)
+
+
+@dataclass
+class Server:
+    url: str   # websocket URL for Session
+    pid: int
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def serve(app_path, port=None, env=None, timeout=30, warmup=False):
+    """Run `streamlit run app_path` headless on a local port; yields a Server.
+
+    With warmup, the server is started through warmup.py, so it only comes up
+    once the shared caches are filled.
+    """
+    port = port or free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "warmup" if warmup else "streamlit", "run", app_path, "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=os.path.dirname(os.path.abspath(app_path)),
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+                break
+            except OSError:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"streamlit server for {app_path} did not come up")
+                time.sleep(0.05)
+        yield Server(f"ws://127.0.0.1:{port}/_stcore/stream", proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def rss_kib(pid):
+    """Resident set size of a process in KiB (Linux /proc), or 0 if unavailable."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
@@ -0,0 +1,90 @@
+"""Cold-start benchmark: launch to first render, with and without warm-up.
+
+Starts a fresh server the way a restarted container would (new process,
+empty stores) and times three things: launch until the health check
+answers, the first session's first render (the home page), and that
+session's first Start Game and Daily Puzzle. Started plainly, the first
+session pays for loading the word list, the word bank, the pack and the
+daily puzzle; started through `python -m warmup run`, the server does
+that before it binds the port.
+
+--target-ms fails the run (exit status 1) if the warmed server's slowest
+first interaction, median over --runs launches, is above it. The verdict
+also reports when the warmed server came up and how much later that was
+than a plain start, since warm-up moves work from the first session to
+before the port opens.
+
+Run from the repo root:  python -m bench.coldstart [--runs 5] [--target-ms 500]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from bench.client import Session, serve
+
+ROOT = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+APP  = os.path.join(ROOT, "app.py")
+
+
+async def first_session(url):
+    session = Session(url)
+    home  = await session.connect()
+    start = await session.click(label="▶️ Start Game")
+    await session.click(label="🏠 Back to Home")
+    daily = await session.click(label="📅 Daily Puzzle")
+    await session.close()
+    if session.exception:
+        raise RuntimeError(session.exception)
+    return home.seconds, start.seconds, daily.seconds
+
+
+def launch(warmup):
+    """One cold server: seconds to healthy and to each first interaction."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {"DICTIONARY_CACHE_PATH": os.path.join(tmp, "lookups.sqlite"),
+               "LEADERBOARD_PATH": os.path.join(tmp, "leaderboard.sqlite"),
+               "SESSIONS_PATH": os.path.join(tmp, "sessions.sqlite"), "EVENTS_DIR": os.path.join(tmp, "events")}
+        began = time.perf_counter()
+        with serve(APP, env=env, warmup=warmup, timeout=60) as server:
+            ready = time.perf_counter() - began
+            home, start, daily = asyncio.run(first_session(server.url))
+    return {"ready_ms": ready * 1e3, "home_ms": home * 1e3, "start_ms": start * 1e3, "daily_ms": daily * 1e3,
+            "first_render_ms": (ready + home) * 1e3}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="cold launches per mode")
+    parser.add_argument("--target-ms", type=float, help="fail if a warmed first interaction's median exceeds this")
+    parser.add_argument("--json", help="also write the medians to this file")
+    args = parser.parse_args()
+
+    keys = ("ready_ms", "first_render_ms", "home_ms", "start_ms", "daily_ms")
+    rows = {}
+    print(f"{'mode':>8} " + " ".join(f"{k[:-3]:>13}" for k in keys) + "   (ms, median)")
+    for mode, warmup in (("plain", False), ("warmup", True)):
+        runs = [launch(warmup) for _ in range(args.runs)]
+        rows[mode] = {k: statistics.median(r[k] for r in runs) for k in keys}
+        print(f"{mode:>8} " + " ".join(f"{rows[mode][k]:13.0f}" for k in keys))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+    if args.target_ms is not None:
+        worst = max(rows["warmup"][k] for k in ("home_ms", "start_ms", "daily_ms"))
+        ready = rows["warmup"]["ready_ms"]
+        added = ready - rows["plain"]["ready_ms"]
+        verdict = "FAIL" if worst > args.target_ms else "ok"
+        print(f"{verdict}: slowest first interaction {worst:.0f} ms (target {args.target_ms:.0f} ms), "
+              f"server ready after {ready:.0f} ms ({added:+.0f} ms for warm-up)")
+        if verdict == "FAIL":
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
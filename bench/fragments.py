@@ -0,0 +1,76 @@
+"""Compare a tile tap handled by the board fragment with a whole-script rerun.
+
+Serves two variants of app.py with the native button board: as shipped
+(board_panel is an st.fragment) and with the @st.fragment decorator removed
+so every tap reruns the whole script. Each variant gets the same number of
+select/deselect taps, none of which submit a word. The report gives the
+median server round trip and websocket bytes per tap.
+
+Run from the repo root:  python -m bench.fragments [--taps 40]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+
+from bench.client import Session, serve
+from bench.patch import replace_once, set_constant
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def variant(source, fragments):
+    source = set_constant(source, "CLIENT_BOARD", False)
+    if not fragments:
+        # Only board_panel is a plain @st.fragment (pending_checks passes run_every)
+        source = replace_once(source, "@st.fragment\n@metrics", "@metrics")
+    return source
+
+
+async def tap_loop(url, taps):
+    session = Session(url)
+    await session.connect()
+    await session.click(label="▶️ Start Game")
+    runs = []
+    for _ in range(taps):
+        tile = next(w for w in session.widgets.values() if "-tile_0_0_" in w.id)
+        runs.append(await session.rerun(tile.id, fragment_id=tile.fragment_id))
+    await session.close()
+    return runs
+
+
+def measure(name, source, taps):
+    path = os.path.join(ROOT, f"_bench_{name}.py")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(source)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {"DICTIONARY_CACHE_PATH": os.path.join(tmp, "lookups.sqlite"),
+                   "LEADERBOARD_PATH": os.path.join(tmp, "leaderboard.sqlite"),
+                   "SESSIONS_PATH": os.path.join(tmp, "sessions.sqlite"), "EVENTS_DIR": os.path.join(tmp, "events")}
+            with serve(path, env=env) as server:
+                runs = asyncio.run(tap_loop(server.url, taps))
+    finally:
+        os.remove(path)
+    return statistics.median(r.seconds for r in runs) * 1e3, statistics.median(r.bytes for r in runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--taps", type=int, default=40)
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT, "app.py"), encoding="utf-8") as f:
+        source = f.read()
+    full_ms, full_bytes = measure("full", variant(source, fragments=False), args.taps)
+    frag_ms, frag_bytes = measure("fragment", variant(source, fragments=True), args.taps)
+
+    print(f"{'per tap':>14} {'ms':>8} {'bytes':>8}")
+    print(f"{'whole script':>14} {full_ms:8.1f} {full_bytes:8.0f}")
+    print(f"{'fragment':>14} {frag_ms:8.1f} {frag_bytes:8.0f}")
+    print(f"{'reduction':>14} {1 - frag_ms / full_ms:8.0%} {1 - frag_bytes / full_bytes:8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Concurrent-session load test for app.py.
+
+Serves the app headless with the stub dictionary, then plays N simulated
+players at once over the browser's websocket protocol. Each player presses
+Start Game and plays every demo word until the demo ends. A word starts with
+an untraceable guess or a traceable near miss, which costs an attempt. The
+player then submits the real words traceable on the board (bonus words and,
+eventually, the target) and presses Next Word. With --board native, words are
+entered tile by tap instead of through the board component.
+
+For each concurrency level it reports rerun latency percentiles (click to
+script finished), reruns per second and server RSS growth per session.
+
+Run from the repo root:  python -m bench.load [--sessions 1,5,10,25] [--board native]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from bench.client import Session, rss_kib, serve
+from bench.patch import set_constant
+from bench.stubdict import stub_dictionary
+from board import near_misses, neighbor_masks, solve_board, unflatten
+from dictionary import load_index
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def variant(source, board):
+    source = set_constant(source, "DICT_HTTP_FALLBACK", True)
+    if board == "native":
+        source = set_constant(source, "CLIENT_BOARD", False)
+    return source
+
+
+def find_path(cells, size, word):
+    """Cell indexes spelling word on the flat board, or None."""
+    neighbors = neighbor_masks(size, size)
+
+    def extend(path, visited):
+        if len(path) == len(word):
+            return path
+        options = neighbors[path[-1]] & ~visited if path else (1 << len(cells)) - 1
+        while options:
+            bit = options & -options
+            options ^= bit
+            i = bit.bit_length() - 1
+            if cells[i] == word[len(path)]:
+                found = extend(path + [i], visited | bit)
+                if found:
+                    return found
+        return None
+
+    return extend([], 0)
+
+
+class Player:
+    def __init__(self, url, board, rng, think):
+        self.session = Session(url)
+        self.board   = board
+        self.rng     = rng
+        self.think   = think
+        self.runs    = []  # (action, Run)
+
+    async def act(self, action, widget_id, fragment_id="", json_value=None):
+        if self.think:
+            await asyncio.sleep(self.rng.expovariate(1 / self.think))
+        run = await self.session.rerun(widget_id, json_value=json_value, fragment_id=fragment_id)
+        if self.session.exception:
+            raise RuntimeError(f"{action}: {self.session.exception}")
+        self.runs.append((action, run))
+
+    async def click(self, label):
+        w = self.session.find(label=label)
+        if w is None:
+            return False
+        await self.act(label, w.id, w.fragment_id)
+        return True
+
+    def current_board(self):
+        """(cells, size, length) of the board on screen, or None if the game stage is over."""
+        for w in self.session.widgets.values():
+            if w.kind == "component_instance":
+                args = json.loads(w.args)
+                return args["cells"], args["size"], args["length"]
+        tiles = {w.id.rsplit("-", 1)[1]: w for w in self.session.widgets.values()
+                 if w.kind == "button" and "-tile_" in w.id}
+        if not tiles:
+            return None
+        size = int(len(tiles) ** 0.5)
+        cells = [""] * len(tiles)
+        for key, w in tiles.items():
+            _, r, c, _ = key.split("_")
+            cells[int(r) * size + int(c)] = w.label
+        length = next(int(m.split("</b> ")[1].split()[0]) for m in self.session.markdown if "Length:" in m)
+        return "".join(cells), size, length
+
+    async def submit(self, path, size):
+        if self.board == "component":
+            w = next(w for w in self.session.widgets.values() if w.kind == "component_instance")
+            value = json.dumps({"path": path, "seq": len(self.runs)})
+            await self.act("submit", w.id, w.fragment_id, json_value=value)
+            return
+        for i in path:
+            key = f"-tile_{i // size}_{i % size}_"
+            w = next(w for w in self.session.widgets.values() if w.kind == "button" and key in w.id)
+            await self.act("tap", w.id, w.fragment_id)
+
+    def random_path(self, size, length):
+        neighbors = neighbor_masks(size, size)
+        while True:
+            path = [self.rng.randrange(size * size)]
+            visited = 1 << path[0]
+            while len(path) < length:
+                options = [i for i in range(size * size) if neighbors[path[-1]] >> i & 1 and not visited >> i & 1]
+                if not options:
+                    break
+                path.append(self.rng.choice(options))
+                visited |= 1 << path[-1]
+            if len(path) == length:
+                return path
+
+    async def play_word(self):
+        cells, size, length = self.current_board()
+        board = unflatten(cells, size)
+        words = sorted(solve_board(board, load_index(), length, length))
+        self.rng.shuffle(words)
+        # Open with a wrong guess: a near miss the app checks remotely, if the board has one
+        misses = sorted(near_misses(board, load_index(), length))
+        for word in ([self.rng.choice(misses)] if misses else []) + words:
+            if self.current_board() is None:
+                return
+            await self.submit(find_path(cells, size, word), size)
+        # Guesses still being checked (the browser would poll), or the target
+        # wasn't in our list: rerun, or burn attempts until the round ends
+        for _ in range(50):
+            if self.current_board() is None:
+                return
+            if any(m.startswith("⏳ Checking") for m in self.session.markdown):
+                await asyncio.sleep(0.1)
+                await self.act("poll", None)
+            else:
+                await self.submit(self.random_path(size, length), size)
+        raise RuntimeError("round did not end")
+
+    async def run(self):
+        start = time.perf_counter()
+        self.runs.append(("connect", await self.session.connect()))
+        await self.click("▶️ Start Game")
+        while self.current_board() is not None:
+            await self.play_word()
+            if not await self.click("▶️ Next Word"):
+                break
+        await self.session.close()
+        return time.perf_counter() - start
+
+
+async def level(url, pid, sessions, board, seed, think):
+    players = [Player(url, board, random.Random(seed + i), think) for i in range(sessions)]
+    idle = rss_kib(pid)
+    peak = idle
+    done = asyncio.Event()
+
+    async def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, rss_kib(pid))
+            await asyncio.sleep(0.1)
+
+    sampler = asyncio.create_task(sample())
+    start = time.perf_counter()
+    await asyncio.gather(*(p.run() for p in players))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await sampler
+    seconds = np.array([run.seconds for p in players for _, run in p.runs]) * 1e3
+    return {
+        "sessions": sessions,
+        "reruns":   len(seconds),
+        "p50_ms":   float(np.percentile(seconds, 50)),
+        "p95_ms":   float(np.percentile(seconds, 95)),
+        "p99_ms":   float(np.percentile(seconds, 99)),
+        "per_s":    len(seconds) / elapsed,
+        "kib_per_session": (peak - idle) / sessions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", default="1,5,10,25", help="comma-separated concurrency levels")
+    parser.add_argument("--board", choices=["component", "native"], default="component")
+    parser.add_argument("--think", type=float, default=0.0, help="mean pause before each action, seconds")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", help="also write the rows to this file")
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT, "app.py"), encoding="utf-8") as f:
+        source = variant(f.read(), args.board)
+    path = os.path.join(ROOT, f"_bench_load_{args.board}.py")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(source)
+    rows = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp, stub_dictionary(delay=0.05) as (dict_url, _):
+            env = {"DICTIONARY_API_URL": dict_url, "DICTIONARY_CACHE_PATH": os.path.join(tmp, "lookups.sqlite"),
+                   "LEADERBOARD_PATH": os.path.join(tmp, "leaderboard.sqlite"),
+                   "SESSIONS_PATH": os.path.join(tmp, "sessions.sqlite"), "EVENTS_DIR": os.path.join(tmp, "events")}
+            with serve(path, env=env) as server:
+                asyncio.run(level(server.url, server.pid, 1, args.board, args.seed, 0))  # warm up
+                print(f"{'sessions':>8} {'reruns':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+                      f"{'reruns/s':>9} {'KiB/sess':>9}")
+                for n in (int(s) for s in args.sessions.split(",")):
+                    row = asyncio.run(level(server.url, server.pid, n, args.board, args.seed, args.think))
+                    rows.append(row)
+                    print(f"{n:8d} {row['reruns']:7d} {row['p50_ms']:8.1f} {row['p95_ms']:8.1f} "
+                          f"{row['p99_ms']:8.1f} {row['per_s']:9.1f} {row['kib_per_session']:9.0f}")
+    finally:
+        os.remove(path)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
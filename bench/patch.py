@@ -0,0 +1,23 @@
+"""Edits to app.py source for benchmark variants.
+
+Each edit must match exactly once; otherwise it raises instead of quietly
+leaving the app as it was, so a benchmark never measures a configuration
+other than the one it names.
+"""
+import re
+
+
+def replace_once(source, old, new):
+    count = source.count(old)
+    if count != 1:
+        raise ValueError(f"expected exactly one {old!r} in the app source, found {count}")
+    return source.replace(old, new)
+
+
+def set_constant(source, name, value):
+    """Set a module-level `NAME = ...` assignment to value, keeping any trailing comment."""
+    pattern = re.compile(rf"^({re.escape(name)}\s*=\s*)[^#\n]*?(\s*(?:#.*)?)$", re.MULTILINE)
+    source, count = pattern.subn(lambda m: f"{m.group(1)}{value!r}{m.group(2)}", source)
+    if count != 1:
+        raise ValueError(f"expected exactly one assignment to {name} in the app source, found {count}")
+    return source
@@ -0,0 +1,85 @@
+"""Compare the bitmask word_exists against the original list-of-lists DFS.
+
+Run from the repo root:  python -m bench.paths
+"""
+import random
+import string
+import timeit
+
+from board import word_exists
+
+
+def legacy_word_exists(board, word):
+    rows, cols = len(board), len(board[0]) if board else 0
+    visited = [[False]*cols for _ in range(rows)]
+    def dfs(r, c, idx):
+        if idx == len(word): return True
+        if not (0 <= r < rows and 0 <= c < cols): return False
+        if visited[r][c] or board[r][c] != word[idx]: return False
+        visited[r][c] = True
+        for dr, dc in [(1,0),(-1,0),(0,1),(0,-1)]:
+            if dfs(r+dr, c+dc, idx+1):
+                visited[r][c] = False
+                return True
+        visited[r][c] = False
+        return False
+    return any(dfs(i, j, 0) for i in range(rows) for j in range(cols))
+
+
+def random_board(rng, size, alphabet=string.ascii_uppercase):
+    return [[rng.choice(alphabet) for _ in range(size)] for _ in range(size)]
+
+
+def random_path_word(rng, board, length):
+    """Read a word off a random self-avoiding walk so it is guaranteed traceable."""
+    size = len(board)
+    while True:
+        r, c = rng.randrange(size), rng.randrange(size)
+        path = [(r, c)]
+        while len(path) < length:
+            options = [(r+dr, c+dc) for dr, dc in [(1,0),(-1,0),(0,1),(0,-1)]
+                       if 0 <= r+dr < size and 0 <= c+dc < size and (r+dr, c+dc) not in path]
+            if not options:
+                break
+            r, c = rng.choice(options)
+            path.append((r, c))
+        if len(path) == length:
+            return "".join(board[r][c] for r, c in path)
+
+
+def cases(rng, size):
+    board = random_board(rng, size)
+    hits  = [random_path_word(rng, board, 5) for _ in range(20)]
+    # Letters that are on the board, in an order that almost never traces
+    letters = [ch for row in board for ch in row]
+    misses  = ["".join(rng.choice(letters) for _ in range(5)) for _ in range(20)]
+    misses  = [w for w in misses if not legacy_word_exists(board, w)]
+    # Worst case: a board of one letter and a word whose last letter is walled off,
+    # so every path of A's has to be explored before giving up
+    flood = [["A"] * size for _ in range(size)]
+    flood[0][0], flood[0][1], flood[1][0] = "B", "C", "C"
+    worst = ["A" * 8 + "B"]
+    return {"hit": (board, hits), "miss": (board, misses), "repeated": (flood, worst)}
+
+
+def bench(fn, board, words, number=None, repeat=5):
+    number = number or max(1, 200 // len(words))
+    best = min(timeit.repeat(lambda: [fn(board, w) for w in words], number=number, repeat=repeat))
+    return best / (number * len(words)) * 1e6
+
+
+def main():
+    rng = random.Random(1234)
+    print(f"{'board':>6} {'case':>9} {'legacy µs':>11} {'bitmask µs':>11} {'speedup':>8}")
+    for size in (4, 6, 8):
+        for name, (board, words) in cases(rng, size).items():
+            if not words:
+                continue
+            assert all(word_exists(board, w) == legacy_word_exists(board, w) for w in words)
+            old = bench(legacy_word_exists, board, words, number=1 if name == "repeated" else None)
+            new = bench(word_exists, board, words)
+            print(f"{size}x{size:<4} {name:>9} {old:11.1f} {new:11.1f} {old / new:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
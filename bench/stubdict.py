@@ -0,0 +1,52 @@
+"""Local stand-in for dictionaryapi.dev.
+
+Answers GET /<word> with 200 or 404 after an optional delay, so benchmarks
+and load tests exercise the real DictionaryClient without the network. An
+outage can be simulated with status, which may answer any other code.
+Point the app at it with DICTIONARY_API_URL=<url>.
+"""
+import contextlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+
+def plural_or_past(word):
+    """Default verdict: the kind of inflected forms the bundled list often lacks."""
+    return word.endswith(("s", "ed", "ing"))
+
+
+@contextlib.contextmanager
+def stub_dictionary(is_real=plural_or_past, delay=0.0, status=None):
+    """Serve a stub dictionary on a free local port; yields (url template, list of requested words).
+
+    status(word), if given, returns the HTTP status to send, or None for the usual 200/404.
+    """
+    requested = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+        def do_GET(self):
+            word = unquote(self.path.rsplit("/", 1)[-1]).lower()
+            requested.append(word)
+            if delay:
+                time.sleep(delay)
+            code = status(word) if status else None
+            self.send_response(code or (200 if is_real(word) else 404))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/{{}}", requested
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,251 @@
+"""Benchmark suite for game-logic hot paths and full-script reruns.
+
+Times board generation, word_exists (hits, misses, repeated-letter worst
+case), evaluate_guess, pick_unused_word and a full AppTest rerun of each
+stage. The remote dictionary is a local stub (bench.stubdict) and the lookup
+cache a throwaway file, so runs are reproducible and offline. Results are
+written as JSON; pass a previous result file as --baseline to flag anything
+that got slower by more than --tolerance.
+
+Run from the repo root:
+    python -m bench.suite --out bench/results.json
+    python -m bench.suite --baseline bench/baseline.json
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+import numpy as np
+
+from bench.patch import set_constant
+from bench.paths import cases
+from bench.stubdict import stub_dictionary
+from board import flatten, generate_board, neighbor_masks, solve_board, word_exists
+from wordbank import load_bank
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Appended to a copy of app.py: when the suite asks for it, time the game
+# logic with the app's own functions and session state
+LOGIC_HOOK = """
+
+if st.session_state.get("_bench_logic"):
+    from bench.suite import time_logic
+    st.session_state["_bench_results"] = time_logic(globals())
+"""
+
+
+def best_us(fn, number, repeat=5):
+    """Fastest of repeat runs, in microseconds per call."""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def bench_board():
+    results = {}
+    words = itertools.cycle(load_bank().words)
+    rng   = np.random.default_rng(1234)
+    results["generate_board"] = best_us(lambda: generate_board(next(words), 4, rng=rng), number=500)
+
+    case_rng = random.Random(1234)
+    for size in (4, 8):
+        for name, (board, words_) in cases(case_rng, size).items():
+            if words_:
+                per_call = best_us(lambda: [word_exists(board, w) for w in words_], number=50, repeat=7)
+                results[f"word_exists/{size}x{size}/{name}"] = per_call / len(words_)
+    return results
+
+
+def traced_non_word(board, length, index):
+    """First string of length letters traceable on board that index lacks (depth-first from cell 0)."""
+    cells, size = flatten(board), len(board)
+    neighbors = neighbor_masks(size, size)
+
+    def walk(cell, prefix, visited):
+        prefix += cells[cell]
+        if len(prefix) == length:
+            return None if prefix in index else prefix
+        options = neighbors[cell] & ~visited
+        while options:
+            bit = options & -options
+            options ^= bit
+            found = walk(bit.bit_length() - 1, prefix, visited | bit)
+            if found:
+                return found
+        return None
+
+    return next(filter(None, (walk(i, "", 1 << i) for i in range(len(cells)))), None)
+
+
+def time_logic(app):
+    """Time pick_unused_word and evaluate_guess inside a live app run (called by LOGIC_HOOK)."""
+    from board import near_misses
+    from dictionary import load_index
+
+    game = app["game_state"]()
+    random.seed(1234)
+    game.bank_cursor = (1234, 0)
+    results = {"pick_unused_word": best_us(app["pick_unused_word"], number=5000, repeat=7)}
+
+    game.words_played, game.bank_cursor = 0, (1234, 0)
+    app["start_new_game"]()
+    game.cancel_prefetch()  # keep the prefetch threads from competing with the timings
+    # Same board every run (start_new_game deals a random one)
+    target = game.target
+    game.set_board(generate_board(target, game.size, rng=np.random.default_rng(1234)))
+    game.solutions = frozenset(solve_board(game.board, load_index(), len(target), len(target)) | {target})
+    misses = sorted(near_misses(game.board, load_index(), len(target)))
+    guesses = {
+        "target":   target,
+        "bonus":    next(iter(sorted(game.solutions - {target})), target),
+        # Answered by the remote dictionary (cached): a likely inflection if the board has one
+        "lookup":   misses[0] if misses else traced_non_word(game.board, len(target), load_index()),
+        "untraced": "Q" * len(target),
+    }
+
+    def judge(guess):
+        game.attempts, game.stage, game.bonus_words, game.pending = 0, "game", set(), []
+        game.history.clear()
+        app["evaluate_guess"](guess)
+
+    for name, guess in guesses.items():
+        judge(guess)  # the first remote lookup fills the cache; time the steady state
+        results[f"evaluate_guess/{name}"] = best_us(lambda: judge(guess), number=500, repeat=7)
+    return results
+
+
+def bench_logic(app_path):
+    from streamlit.testing.v1 import AppTest
+
+    with open(app_path, encoding="utf-8") as f:
+        source = f.read()
+    source = set_constant(source, "DICT_HTTP_FALLBACK", True)
+    source = set_constant(source, "ASYNC_CHECKS", False)  # judge inline
+    path = os.path.join(ROOT, "_bench_suite.py")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(source + LOGIC_HOOK)
+    try:
+        at = AppTest.from_file(path, default_timeout=120)
+        at.session_state["_bench_logic"] = True
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        return at.session_state["_bench_results"]
+    finally:
+        os.remove(path)
+
+
+def bench_stages(app_path, runs):
+    """Median wall time of a full AppTest rerun on each stage."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app_path, default_timeout=60)
+
+    def timed():
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            at.run()
+            times.append(time.perf_counter() - start)
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+        return statistics.median(times) * 1e6
+
+    results = {"rerun/home": timed()}
+    next(b for b in at.button if b.label == "▶️ Start Game").click().run()
+    results["rerun/game"] = timed()
+
+    game = at.session_state["game"]
+    game.history.extend({"word": "WORD", "result": "win", "attempts": 1, "points": 10,
+                         "bonus_words": 0, "bonus_possible": 0} for _ in range(3))
+    game.last_msg, game.stage = ("win", "🎉 Correct!"), "result"
+    at.session_state["game"] = game
+    results["rerun/result"] = timed()
+
+    game.stage = "subscribe"
+    at.session_state["game"] = game
+    results["rerun/subscribe"] = timed()
+    return results
+
+
+def metadata():
+    import streamlit
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit, dirty = "", ""
+    if commit and dirty:
+        commit += "-dirty"  # measured code is not exactly that commit
+    return {"python": platform.python_version(), "streamlit": streamlit.__version__,
+            "machine": platform.machine(), "commit": commit, "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def compare(results, baseline, tolerance):
+    """Print results against baseline; returns the names that regressed."""
+    regressed = []
+    print(f"{'benchmark':<32} {'µs':>11} {'baseline':>11} {'ratio':>7}")
+    for name, value in results.items():
+        old = baseline.get(name)
+        if old is None:
+            print(f"{name:<32} {value:11.1f} {'—':>11}")
+            continue
+        ratio = value / old
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressed.append(name)
+            flag = "  ← slower"
+        print(f"{name:<32} {value:11.1f} {old:11.1f} {ratio:6.2f}x{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--runs", type=int, default=20, help="AppTest reruns per stage")
+    args = parser.parse_args()
+
+    app_path = os.path.join(ROOT, "app.py")
+    with tempfile.TemporaryDirectory() as tmp, stub_dictionary() as (url, _):
+        # Read when dictionary / leaderboard are first imported or used
+        os.environ["DICTIONARY_API_URL"]    = url
+        os.environ["DICTIONARY_CACHE_PATH"] = os.path.join(tmp, "lookups.sqlite")
+        os.environ["LEADERBOARD_PATH"]      = os.path.join(tmp, "leaderboard.sqlite")
+        os.environ["SESSIONS_PATH"]         = os.path.join(tmp, "sessions.sqlite")
+        os.environ["EVENTS_DIR"]            = os.path.join(tmp, "events")
+        results = {}
+        results.update(bench_board())
+        results.update(bench_logic(app_path))
+        results.update(bench_stages(app_path, args.runs))
+
+    report = {"meta": metadata(), "unit": "µs", "results": results}
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    regressed = compare(results, baseline, args.tolerance)
+    if regressed:
+        print(f"\n{len(regressed)} benchmark(s) slower than baseline by more than {args.tolerance:.0%}: "
+              + ", ".join(regressed))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""Board search helpers shared by the game and offline tooling.
+
+Boards are square-ish grids of single uppercase letters (rows x cols, up to
+8 x 8). Internally cells are numbered row-major and a set of cells is an
+integer bitmask, so "visited", "cells holding letter X" and "neighbors of
+cell i" are all plain ints combined with & and |. Only board generation
+needs NumPy, so it is imported on first use and the search helpers load
+without it.
+"""
+from functools import lru_cache
+
+MAX_BOARD_SIZE = 8
+DIRECTIONS     = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+DIAGONALS      = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+# Relative frequency of each letter in English text, A..Z
+LETTER_FREQUENCIES = (
+    8.2, 1.5, 2.8, 4.3, 12.7, 2.2, 2.0, 6.1, 7.0, 0.15, 0.77, 4.0, 2.4,
+    6.7, 7.5, 1.9, 0.095, 6.0, 6.3, 9.1, 2.8, 0.98, 2.4, 0.15, 2.0, 0.074,
+)
+
+
+@lru_cache(maxsize=None)
+def _alphabet():
+    """(letters, weights): A..Z as a uint8 array and LETTER_FREQUENCIES normalised to sum to 1."""
+    import numpy as np
+
+    weights = np.array(LETTER_FREQUENCIES)
+    return np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype=np.uint8), weights / weights.sum()
+
+
+@lru_cache(maxsize=None)
+def neighbor_masks(rows, cols, diagonal=False):
+    """Bitmask of neighboring cells for every cell of a rows x cols board."""
+    if not (0 < rows <= MAX_BOARD_SIZE and 0 < cols <= MAX_BOARD_SIZE):
+        raise ValueError(f"Board must be between 1x1 and {MAX_BOARD_SIZE}x{MAX_BOARD_SIZE}, got {rows}x{cols}")
+    steps = DIRECTIONS + DIAGONALS if diagonal else DIRECTIONS
+    masks = []
+    for r in range(rows):
+        for c in range(cols):
+            mask = 0
+            for dr, dc in steps:
+                if 0 <= r + dr < rows and 0 <= c + dc < cols:
+                    mask |= 1 << ((r + dr) * cols + c + dc)
+            masks.append(mask)
+    return tuple(masks)
+
+
+@lru_cache(maxsize=256)
+def letter_masks(cells):
+    """Map each letter in the flat cells string to the bitmask of cells holding it."""
+    masks = {}
+    for i, letter in enumerate(cells):
+        masks[letter] = masks.get(letter, 0) | (1 << i)
+    return masks
+
+
+def flatten(board):
+    return "".join("".join(row) for row in board)
+
+
+def unflatten(cells, cols):
+    return [list(cells[i:i + cols]) for i in range(0, len(cells), cols)]
+
+
+def cells_of(mask):
+    """List the cell indexes set in mask, lowest first."""
+    cells = []
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        cells.append(bit.bit_length() - 1)
+    return cells
+
+
+def place_path(length, rows, cols, keys, diagonal=False):
+    """Find a self-avoiding path of length cells, or None if the board is too small.
+
+    keys is a (length, rows*cols) table of random priorities: at step i the
+    walk tries free neighbors in increasing keys[i] order and backtracks when
+    it gets stuck, so the path it returns is always complete and valid.
+    """
+    if length > rows * cols:
+        return None
+    neighbors = neighbor_masks(rows, cols, diagonal)
+    path = []
+
+    def extend(options, visited):
+        depth = len(path)
+        if depth == length:
+            return True
+        priority = keys[depth]
+        for cell in sorted(cells_of(options & ~visited), key=priority.__getitem__):
+            path.append(cell)
+            if extend(neighbors[cell], visited | (1 << cell)):
+                return True
+            path.pop()
+        return False
+
+    return path if extend((1 << rows * cols) - 1, 0) else None
+
+
+def generate_boards(words, rows, cols=None, rng=None, weighted=False, diagonal=False):
+    """Generate one board per word, each with its word guaranteed traceable.
+
+    Returns (cells, paths): cells is an (N, rows*cols) uint8 array of ASCII
+    letters and paths[i] the cell indexes spelling words[i]. Filler letters
+    for all N boards are drawn in a single NumPy call, uniformly or weighted
+    by English letter frequency.
+    """
+    import numpy as np
+
+    cols = cols or rows
+    rng  = rng if rng is not None else np.random.default_rng()
+    size = rows * cols
+    longest = max((len(w) for w in words), default=0)
+    if longest > size:
+        raise ValueError(f"Can't place a {longest}-letter word on a {rows}x{cols} board")
+
+    alphabet, weights = _alphabet()
+    cells = rng.choice(alphabet, size=(len(words), size), p=weights if weighted else None)
+    keys  = rng.random((len(words), longest, size)).tolist()
+    paths = []
+    for i, word in enumerate(words):
+        path = place_path(len(word), rows, cols, keys[i], diagonal)
+        cells[i, path] = np.frombuffer(word.upper().encode("ascii"), dtype=np.uint8)
+        paths.append(path)
+    return cells, paths
+
+
+def generate_board(word, size=4, rng=None, weighted=False):
+    """Return a size x size board (list of rows of letters) with word traceable on it."""
+    cells, _ = generate_boards([word], size, rng=rng, weighted=weighted)
+    return unflatten(cells[0].tobytes().decode("ascii"), size)
+
+
+def word_exists(board, word, diagonal=False):
+    """Return True if word can be traced through adjacent, unrepeated cells of board."""
+    rows, cols = len(board), len(board[0]) if board else 0
+    if not rows or not cols:
+        return False
+    if not word:
+        return True
+    cells = flatten(board)
+    if len(word) > len(cells):
+        return False
+    # A board holding fewer copies of any letter than the word needs can't contain it
+    for letter in set(word):
+        if word.count(letter) > cells.count(letter):
+            return False
+
+    neighbors = neighbor_masks(rows, cols, diagonal)
+    allowed   = _allowed_masks(cells, word, neighbors)
+    if allowed is None:
+        return False
+    last = len(word) - 1
+
+    def extend(cell, idx, visited):
+        if idx > last:
+            return True
+        options = neighbors[cell] & allowed[idx] & ~visited
+        while options:
+            bit = options & -options
+            options ^= bit
+            if extend(bit.bit_length() - 1, idx + 1, visited | bit):
+                return True
+        return False
+
+    starts = allowed[0]
+    while starts:
+        bit = starts & -starts
+        starts ^= bit
+        if extend(bit.bit_length() - 1, 1, bit):
+            return True
+    return False
+
+
+def _allowed_masks(cells, word, neighbors):
+    """Per letter of word, the cells that can hold it and still reach a cell for the next letter.
+
+    Built backwards from the last letter, ignoring reuse, so it is cheap and a
+    forward search never has to leave these masks. None if some letter has no cell.
+    """
+    where = letter_masks(cells)
+    last  = len(word) - 1
+    allowed = [0] * len(word)
+    allowed[last] = where.get(word[last], 0)
+    for idx in range(last - 1, -1, -1):
+        reach, nxt = 0, allowed[idx + 1]
+        while nxt:
+            bit = nxt & -nxt
+            nxt ^= bit
+            reach |= neighbors[bit.bit_length() - 1]
+        allowed[idx] = where.get(word[idx], 0) & reach
+        if not allowed[idx]:
+            return None
+    return allowed if allowed[last] else None
+
+
+def count_paths(board, word, diagonal=False):
+    """Number of distinct cell paths spelling word on board (0 if it can't be traced)."""
+    rows, cols = len(board), len(board[0]) if board else 0
+    if not rows or not cols or not word:
+        return 0
+    cells = flatten(board)
+    if len(word) > len(cells):
+        return 0
+    neighbors = neighbor_masks(rows, cols, diagonal)
+    allowed   = _allowed_masks(cells, word, neighbors)
+    if allowed is None:
+        return 0
+    last = len(word) - 1
+
+    def extend(cell, idx, visited):
+        if idx > last:
+            return 1
+        total, options = 0, neighbors[cell] & allowed[idx] & ~visited
+        while options:
+            bit = options & -options
+            options ^= bit
+            total += extend(bit.bit_length() - 1, idx + 1, visited | bit)
+        return total
+
+    total, starts = 0, allowed[0]
+    while starts:
+        bit = starts & -starts
+        starts ^= bit
+        total += extend(bit.bit_length() - 1, 1, bit)
+    return total
+
+
+def solve_board(board, index, min_len=3, max_len=None, diagonal=False):
+    """Return the set of words in index that can be traced on board.
+
+    Walks every path from every cell, extending the index prefix range one
+    letter at a time and abandoning a path as soon as no word starts with it.
+    """
+    rows, cols = len(board), len(board[0]) if board else 0
+    if not rows or not cols:
+        return set()
+    cells     = flatten(board)
+    neighbors = neighbor_masks(rows, cols, diagonal)
+    if max_len is None:
+        max_len = len(cells)
+    words = index.words
+    found = set()
+
+    def walk(cell, prefix, lo, hi, visited):
+        prefix += cells[cell]
+        lo, hi = index.prefix_range(prefix, lo, hi)
+        if lo == hi:
+            return
+        if len(prefix) >= min_len and words[lo] == prefix:
+            found.add(prefix)
+        if len(prefix) == max_len:
+            return
+        options = neighbors[cell] & ~visited
+        while options:
+            bit = options & -options
+            options ^= bit
+            walk(bit.bit_length() - 1, prefix, lo, hi, visited | bit)
+
+    for cell in range(len(cells)):
+        walk(cell, "", 0, len(words), 1 << cell)
+    return found
+
+
+INFLECTIONS = ("S", "ES", "D", "ED", "R", "ER", "ST", "EST", "ING", "LY")
+
+
+def _fits(stem, suffix):
+    """Spelling rules for attaching suffix: BAKE+D, JUMP+ED, BOX+ES, not BOX+S or JUMP+D."""
+    if suffix in ("D", "R", "ST"):
+        return stem.endswith("E")
+    if suffix in ("ED", "ER", "EST"):
+        return not stem.endswith("E")
+    if suffix == "ES":
+        return stem.endswith(("S", "X", "Z", "CH", "SH"))
+    if suffix == "S":
+        return not stem.endswith(("S", "X", "Z"))
+    return True
+
+
+def _inflects(prefix, length, index, suffixes):
+    """Whether prefix can still end as an index word plus one of suffixes, length letters in all."""
+    for suffix in suffixes:
+        k = length - len(suffix)
+        if (0 < k <= len(prefix) and suffix.startswith(prefix[k:])
+                and _fits(prefix[:k], suffix) and prefix[:k] in index):
+            return True
+    return False
+
+
+def near_misses(board, index, length, diagonal=False, suffixes=INFLECTIONS):
+    """Return strings of exactly length letters traceable on board that are not in index
+    but are an index word plus one of suffixes.
+
+    These are the plausible guesses the bundled list can't settle (mostly
+    inflections it lacks), i.e. the ones a remote dictionary would be asked
+    about. Anything else traceable is taken to be a non-word without asking.
+    """
+    rows, cols = len(board), len(board[0]) if board else 0
+    if not rows or not cols or length < 1:
+        return set()
+    cells     = flatten(board)
+    neighbors = neighbor_masks(rows, cols, diagonal)
+    found = set()
+
+    def walk(cell, prefix, lo, hi, visited):
+        prefix += cells[cell]
+        if len(prefix) == length:
+            if prefix not in index and _inflects(prefix, length, index, suffixes):
+                found.add(prefix)
+            return
+        lo, hi = index.prefix_range(prefix, lo, hi)
+        if lo == hi and not _inflects(prefix, length, index, suffixes):
+            return
+        options = neighbors[cell] & ~visited
+        while options:
+            bit = options & -options
+            options ^= bit
+            walk(bit.bit_length() - 1, prefix, lo, hi, visited | bit)
+
+    for cell in range(len(cells)):
+        walk(cell, "", 0, len(index), 1 << cell)
+    return found
@@ -0,0 +1,53 @@
+"""Daily puzzle shared by every session.
+
+The day's target, board and solved word set are derived from the UTC date
+alone: the date seeds the word-bank shuffle, the puzzle-pack pick and the
+board generator, so every process on every host deals the same puzzle.
+Each process works it out once per day and hands the same frozen result
+to all of its sessions.
+"""
+import random
+import time
+from functools import lru_cache
+
+from board import generate_board, near_misses, solve_board
+from dictionary import load_index
+from puzzles import load_pack
+from wordbank import load_bank
+
+
+class DailyPuzzle:
+    __slots__ = ("day", "level", "board", "solutions", "misses")
+
+    def __init__(self, day, level, board, solutions, misses):
+        self.day       = day
+        self.level     = level      # {"word", "clue"}
+        self.board     = board      # rows of letters
+        self.solutions = solutions  # frozenset of real words of the target's length on the board
+        self.misses    = misses     # frozenset of plausible guesses the bundled list can't settle
+
+
+def today():
+    return time.strftime("%Y-%m-%d", time.gmtime())
+
+
+@lru_cache(maxsize=2)  # today, plus yesterday for sessions still on it around midnight
+def load_daily(day, size=4):
+    """The puzzle for day ("YYYY-MM-DD"), computed once per process."""
+    seed   = int(day.replace("-", ""))
+    level  = load_bank().draw(seed, 0)
+    target = level["word"].upper()
+    board  = None
+    pack   = load_pack()
+    if pack is not None and pack.rows == pack.cols == size:
+        puzzle = pack.pick(target, rng=random.Random(seed))
+        if puzzle:
+            board = puzzle["board"]
+    if board is None:
+        import numpy as np
+
+        board = generate_board(target, size, rng=np.random.default_rng(seed))
+    index = load_index()
+    solutions = solve_board(board, index, min_len=len(target), max_len=len(target))
+    solutions.add(target)
+    return DailyPuzzle(day, level, board, frozenset(solutions), frozenset(near_misses(board, index, len(target))))
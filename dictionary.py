@@ -0,0 +1,271 @@
+"""English word lookups for bonus-word validation.
+
+The bundled word list is loaded once per process into a sorted array, so
+membership and prefix checks are binary searches with no network access
+(wordlist.py builds the list; it has no proper nouns or abbreviations).
+dictionaryapi.dev is kept only as an optional fallback backend; its answers
+go through a process-wide LRU cache backed by a small SQLite file, so a word
+is looked up remotely once per host rather than once per session.
+
+Remote lookups go through one DictionaryClient per process: a pooled HTTP
+session, one in-flight request per word however many sessions ask, and a
+circuit breaker that stops waiting on the API once it keeps failing. The
+API URL comes from DICTIONARY_API_URL when set, e.g. to point at a stub,
+and DICTIONARY_CACHE_PATH moves the SQLite file. requests is only imported
+once a client is created, so with the fallback off it is never loaded.
+"""
+import bisect
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import quote
+
+import metrics
+
+WORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "words.txt")
+CACHE_PATH = os.environ.get("DICTIONARY_CACHE_PATH") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "lookups.sqlite")
+API_URL    = "https://api.dictionaryapi.dev/api/v2/entries/en/{}"
+FAIL_OPEN_TTL = 60  # seconds an unverified "real" answer is cached before retrying the API
+
+
+class WordIndex:
+    """Sorted array of uppercase words supporting membership and prefix queries."""
+
+    __slots__ = ("words",)
+
+    def __init__(self, words):
+        self.words = sorted(words)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        words = self.words
+        i = bisect.bisect_left(words, word)
+        return i < len(words) and words[i] == word
+
+    def prefix_range(self, prefix, lo=0, hi=None):
+        """Return the (lo, hi) slice of words starting with prefix, searching only within [lo, hi).
+
+        Passing the range of a shorter prefix narrows the search as a walk extends it.
+        """
+        if hi is None:
+            hi = len(self.words)
+        lo = bisect.bisect_left(self.words, prefix, lo, hi)
+        hi = bisect.bisect_left(self.words, prefix + "\uffff", lo, hi)
+        return lo, hi
+
+
+@lru_cache(maxsize=None)
+def load_index(path=WORDS_PATH):
+    """Load the word list at path (one word per line, '#' comments) once per process."""
+    with open(path, encoding="utf-8") as f:
+        words = [line.strip().upper() for line in f if line.strip() and not line.startswith("#")]
+    return WordIndex(words)
+
+
+class LookupCache:
+    """Thread-safe LRU of {word: bool} remote answers, persisted to SQLite.
+
+    The most recently written capacity rows are loaded on start. Every put
+    is written through to the file (WAL mode, so readers in other processes
+    are not blocked); evicting a word only drops it from memory.
+    """
+
+    def __init__(self, path=CACHE_PATH, capacity=50_000):
+        self.capacity = capacity
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()
+        self._provisional = {}  # word -> (result, expiry) for answers the API never confirmed
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS lookups (word TEXT PRIMARY KEY, real INTEGER NOT NULL, "
+                "checked REAL NOT NULL DEFAULT (julianday('now')))"
+            )
+            rows = self._db.execute(
+                "SELECT word, real FROM lookups ORDER BY rowid DESC LIMIT ?", (capacity,)
+            ).fetchall()
+            for word, real in reversed(rows):
+                self._entries[word] = bool(real)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, word):
+        """Whether word has a live cached answer; unlike get, not counted as a hit or miss."""
+        with self._lock:
+            if word in self._entries:
+                return True
+            provisional = self._provisional.get(word)
+            return provisional is not None and provisional[1] > time.monotonic()
+
+    def get(self, word):
+        """Cached answer for word, or None if it has not been looked up (or expired)."""
+        with self._lock:
+            result = self._entries.get(word)
+            if result is None:
+                provisional = self._provisional.get(word)
+                if provisional is not None:
+                    if provisional[1] > time.monotonic():
+                        result = provisional[0]
+                    else:
+                        del self._provisional[word]
+            else:
+                self._entries.move_to_end(word)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return result
+
+    def put(self, word, result, ttl=None):
+        """Cache result for word; with ttl it is kept in memory only, for ttl seconds."""
+        with self._lock:
+            if ttl is not None:
+                self._provisional[word] = (result, time.monotonic() + ttl)
+                if len(self._provisional) > self.capacity:
+                    now = time.monotonic()
+                    self._provisional = {w: p for w, p in self._provisional.items() if p[1] > now}
+                return
+            self._provisional.pop(word, None)
+            self._entries[word] = result
+            self._entries.move_to_end(word)
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO lookups (word, real) VALUES (?, ?)", (word, int(result))
+                )
+
+    def stats(self):
+        looked_up = self.hits + self.misses
+        return {"size": len(self._entries), "capacity": self.capacity, "hits": self.hits, "misses": self.misses,
+                "hit_ratio": self.hits / looked_up if looked_up else 0.0}
+
+
+@lru_cache(maxsize=None)
+def load_cache(path=CACHE_PATH):
+    """Open the lookup cache at path once per process."""
+    cache = LookupCache(path)
+    metrics.register("dictionary_cache", cache.stats)
+    return cache
+
+
+class DictionaryClient:
+    """Remote word checks against a dictionaryapi.dev-compatible endpoint.
+
+    lookup returns (real, verified). A 200 means real and a 404 not real,
+    both verified. Errors, timeouts and other statuses fail open as
+    (True, False) so the game keeps working; after failure_threshold of
+    them in a row the breaker opens and lookups fail open immediately for
+    reset_after seconds, then a single request is let through to probe.
+    """
+
+    def __init__(self, base_url=API_URL, timeout=3, failure_threshold=3, reset_after=30, pool_size=16):
+        import requests
+
+        self.base_url = base_url
+        self.timeout  = timeout
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self._request_error = requests.RequestException
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.requests = self.coalesced = self.short_circuited = 0
+        self._failures   = 0
+        self._open_until = 0.0
+        self._flights    = {}  # word -> Future of the request in flight
+        self._lock       = threading.Lock()
+
+    def lookup(self, word):
+        """Return (real, verified) for word, sharing any request already in flight for it."""
+        word = word.lower()
+        with self._lock:
+            flight = self._flights.get(word)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                flight = self._flights[word] = Future()
+                leader = True
+        if not leader:
+            return flight.result()
+        try:
+            flight.set_result(self._fetch(word))
+        except BaseException as exc:
+            flight.set_exception(exc)
+        finally:
+            with self._lock:
+                del self._flights[word]
+        return flight.result()
+
+    def _fetch(self, word):
+        with self._lock:
+            if time.monotonic() < self._open_until:
+                self.short_circuited += 1
+                return True, False
+            if self._failures >= self.failure_threshold:
+                # Half-open: this request probes the API, the rest keep failing fast
+                self._open_until = time.monotonic() + self.reset_after
+            self.requests += 1
+        with metrics.timer("dictionary_upstream") as t:
+            try:
+                resp = self.session.get(self.base_url.format(quote(word)), timeout=self.timeout)
+                status = resp.status_code
+                resp.close()
+            except self._request_error:
+                status = None
+            t.set(status=status or "error")
+        with self._lock:
+            if status in (200, 404):
+                self._failures, self._open_until = 0, 0.0
+                return status == 200, True
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._open_until = time.monotonic() + self.reset_after
+        return True, False
+
+    @property
+    def open(self):
+        return time.monotonic() < self._open_until
+
+    def stats(self):
+        return {"requests": self.requests, "coalesced": self.coalesced,
+                "short_circuited": self.short_circuited, "failures": self._failures, "open": self.open}
+
+
+@lru_cache(maxsize=None)
+def load_client(base_url=None):
+    """One DictionaryClient per process, for base_url or DICTIONARY_API_URL or dictionaryapi.dev."""
+    client = DictionaryClient(base_url or os.environ.get("DICTIONARY_API_URL", API_URL))
+    metrics.register("dictionary_client", client.stats)
+    return client
+
+
+def check_remote(word):
+    """Whether the remote dictionary knows word (uppercase), answered from the lookup cache when possible."""
+    cache  = load_cache()
+    result = cache.get(word)
+    if result is None:
+        result, verified = load_client().lookup(word)
+        # An unverified answer (API down, breaker open) is retried after a short while
+        cache.put(word, result, ttl=None if verified else FAIL_OPEN_TTL)
+    return result
+
+
+@lru_cache(maxsize=None)
+def load_executor(workers=8):
+    """Thread pool for dictionary checks that run outside a script rerun."""
+    return ThreadPoolExecutor(workers, thread_name_prefix="dict-check")
@@ -0,0 +1,227 @@
+"""Game rules, independent of Streamlit.
+
+Every function here takes the session's GameState (see state.py) and a
+Rules object and only reads and writes that state, so the same code runs
+inside app.py, in offline tools and in the bot simulator (simulate.py).
+Anything that touches the page, the puzzle pack or the remote dictionary
+stays in app.py and is handed in: the board to deal and an is_real
+callable for words the board solver didn't already settle.
+"""
+import random
+
+import metrics
+from board import solve_board, word_exists
+from wordbank import load_bank
+
+BOARD_SIZE   = 4
+MAX_ATTEMPTS = 3
+DEMO_LIMIT   = 3
+SCORE_MAP    = {1: 10, 2: 5, 3: 3}
+BONUS_POINTS = 1
+CLUE_AFTER   = (1, 2)  # wrong attempts before the starting letter / a middle letter is revealed
+
+
+class Rules:
+    """Tunable constants of a game; RULES holds the ones the app plays with."""
+
+    __slots__ = ("board_size", "max_attempts", "demo_limit", "score_map", "bonus_points", "clue_after")
+
+    def __init__(self, board_size=BOARD_SIZE, max_attempts=MAX_ATTEMPTS, demo_limit=DEMO_LIMIT,
+                 score_map=None, bonus_points=BONUS_POINTS, clue_after=CLUE_AFTER):
+        self.board_size   = board_size
+        self.max_attempts = max_attempts
+        self.demo_limit   = demo_limit
+        self.score_map    = dict(SCORE_MAP if score_map is None else score_map)
+        self.bonus_points = bonus_points
+        self.clue_after   = tuple(clue_after)
+
+    def __repr__(self):
+        return (f"Rules(max_attempts={self.max_attempts}, score_map={self.score_map}, "
+                f"bonus_points={self.bonus_points}, clue_after={self.clue_after})")
+
+
+RULES = Rules()
+
+
+def sanitize_guess(raw):
+    return "".join(filter(str.isalpha, raw)).upper()
+
+
+def get_bonus_clues(target, attempts_used, rules=RULES):
+    clues = []
+    starting, middle = rules.clue_after
+    if attempts_used >= starting:
+        clues.append(f"🔡 **Starting letter:** {target[0]}")
+    if attempts_used >= middle:
+        mid = len(target) // 2
+        clues.append(f"🔠 **Letter {mid+1} in the word:** {target[mid]}")
+    return clues
+
+
+def pick_unused_word(game, bank=None, rng=random):
+    """Draw the next level from this session's shuffled walk through the word bank."""
+    bank = bank if bank is not None else load_bank()
+    seed, position = game.bank_cursor
+    if seed is None or position >= len(bank):
+        # Every word played (or first game): start a fresh shuffle
+        seed, position = rng.getrandbits(64), 0
+    game.bank_cursor = (seed, position + 1)
+    return bank.draw(seed, position)
+
+
+def bonus_word_total(game):
+    """Number of real words other than the target that can be traced on the current board."""
+    return len(game.solutions - {game.target})
+
+
+def demo_over(game, rules=RULES):
+    return game.words_played >= rules.demo_limit
+
+
+# ---------------------------
+# Stage Transitions
+# ---------------------------
+def go_home(game):
+    game.stage       = "home"
+    game.last_msg    = None
+    game.feedback    = None
+    game.bonus_words = set()
+    game.clear_selection()
+    game.pending = []
+    game.cancel_prefetch()
+
+
+def deal(game, level, board, index, solutions=None):
+    """Start a round on board for level ({"word", "clue"}).
+
+    The board is solved against index once, unless its solutions (including
+    the target) are passed in already, e.g. for a shared puzzle.
+    """
+    target = level["word"].upper()
+    if solutions is None:
+        # Solve once per board so every guess is a set lookup
+        solutions = solve_board(board, index, min_len=len(target), max_len=len(target))
+        solutions.add(target)  # generate_board always leaves the target traceable
+    game.pending = []
+    game.cancel_prefetch()
+    game.set_board(board)
+    game.target      = target
+    game.clue        = level["clue"]
+    game.solutions   = frozenset(solutions)
+    game.attempts    = 0
+    game.guess_key  += 1
+    game.last_msg    = None
+    game.feedback    = None
+    game.bonus_words = set()
+    game.clear_selection()
+    game.stage       = "game"
+
+
+def go_result(game, msg_type, msg_text, history_entry):
+    game.history.append(history_entry)
+    if history_entry["result"] == "win":
+        game.wins += 1
+    else:
+        game.losses += 1
+    game.last_msg      = (msg_type, msg_text)
+    game.confetti      = msg_type == "win"
+    game.feedback      = None
+    game.words_played += 1
+    game.clear_selection()
+    game.pending = []
+    game.cancel_prefetch()
+    game.stage         = "result"
+
+
+# ---------------------------
+# Guesses
+# ---------------------------
+def check_guess(game, raw_guess, rules=RULES):
+    """Validate a guess and trace it on the board.
+
+    Returns (guess, solved, traceable) for judge_guess, or None after
+    setting feedback if the guess can't be judged (wrong length, no
+    attempts left, round over).
+    """
+    if game.stage != "game":
+        return None
+    if game.attempts >= rules.max_attempts:
+        game.feedback = ("error", "No attempts left!")
+        return None
+
+    clue  = game.clue
+    guess = sanitize_guess(raw_guess)
+    if not guess:
+        game.feedback = ("warning", "No letters selected.")
+        return None
+    if len(guess) != clue["length"]:
+        game.feedback = ("warning", f"Need {clue['length']} letters, got {len(guess)}.")
+        return None
+
+    # Always clear the tile selection and retire the current tiles
+    game.clear_selection()
+    game.guess_key += 1
+
+    solved = guess in game.solutions
+    if solved:
+        return guess, True, True
+    with metrics.timer("word_exists"):
+        traceable = word_exists(game.board, guess)
+    return guess, False, traceable
+
+
+@metrics.timed("judge_guess", label="outcome")
+def judge_guess(game, guess, solved, traceable, is_real=None, rules=RULES):
+    """Score a checked guess.
+
+    is_real(word) answers for traceable words the board solver didn't find;
+    without it they count as not real. Returns which case applied: "win",
+    "duplicate_bonus", "bonus" or "miss".
+    """
+    target = game.target
+
+    # ── Case 1: correct target word ──
+    if guess == target and solved:
+        game.attempts += 1
+        attempt_number = game.attempts
+        pts = rules.score_map.get(attempt_number, 0)
+        game.total_score += pts
+        go_result(game, "win",
+            f"🎉 Correct! You found **{target}** on attempt {attempt_number} — **+{pts} points!**",
+            {"word": target, "result": "win", "attempts": attempt_number, "points": pts,
+             "bonus_words": len(game.bonus_words),
+             "bonus_possible": bonus_word_total(game)})
+        return "win"
+
+    # ── Case 2: already found this bonus word ──
+    if guess in game.bonus_words:
+        game.feedback = ("warning", f"You already found **{guess}** as a bonus word!")
+        return "duplicate_bonus"
+
+    # ── Case 3: traceable on board + real English word → bonus! ──
+    if solved or (traceable and is_real is not None and is_real(guess)):
+        bonus_pts = rules.bonus_points
+        game.total_score += bonus_pts
+        game.bonus_words.add(guess)
+        game.feedback = (
+            "bonus",
+            f"🌟 Bonus word! **{guess}** is a real word on the board — **+{bonus_pts} pt!** "
+            f"Keep going to find the target word."
+        )
+        return "bonus"
+
+    # ── Case 4: wrong — consume an attempt ──
+    game.attempts += 1
+    attempt_number = game.attempts
+
+    if attempt_number >= rules.max_attempts:
+        go_result(game, "loss",
+            f"💀 Out of attempts! The word was **{target}**.",
+            {"word": target, "result": "loss", "attempts": attempt_number, "points": 0,
+             "bonus_words": len(game.bonus_words),
+             "bonus_possible": bonus_word_total(game)})
+    elif traceable:
+        game.feedback = ("error", "That word is traceable but isn't a real English word or isn't the target!")
+    else:
+        game.feedback = ("error", "Word can't be traced on the board. Try again!")
+    return "miss"
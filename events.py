@@ -0,0 +1,170 @@
+"""Game-event log for analytics.
+
+log() only appends a row to an in-memory buffer, so it never blocks a
+rerun on disk. A daemon thread turns the buffer into one NumPy array per
+column every flush_interval seconds (sooner once it holds batch_size
+events) and writes them as a segment file, events-<time>-<pid>-<n>.npz,
+under EVENTS_DIR. Segments older than keep_days are deleted as new ones
+are written. read_events() loads every segment into one pandas DataFrame.
+
+Kinds: "start" when a round is dealt, then one event per judged guess:
+"win", "loss", "bonus", "duplicate" or "miss". attempt is the attempts
+used after the event and latency_ms the time from submitting the guess to
+judging it (dictionary waits included).
+
+numpy is imported by the first flush that has events to write, pandas
+only by read_events().
+"""
+import atexit
+import glob
+import os
+import threading
+import time
+from functools import lru_cache
+
+import metrics
+
+EVENTS_DIR = os.environ.get("EVENTS_DIR") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "events")
+
+COLUMNS = (  # name, dtype of the column in a segment
+    ("ts",         "<f8"),  # unix time
+    ("kind",       "<U9"),
+    ("session",    "<U32"),
+    ("word",       "<U16"),
+    ("category",   "<U32"),
+    ("attempt",    "u1"),
+    ("points",     "<i2"),
+    ("latency_ms", "<f4"),
+)
+
+
+class EventLog:
+    def __init__(self, directory=EVENTS_DIR, flush_interval=10.0, batch_size=5000, keep_days=30):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.keep_days = keep_days
+        self.logged = self.written = self.segments = 0
+        self._buffer = []
+        self._lock   = threading.Lock()
+        self._wake   = threading.Event()
+        threading.Thread(target=self._work, name="event-log", daemon=True).start()
+        atexit.register(self._flush_at_exit)
+
+    def log(self, kind, session, word, category="", attempt=0, points=0, latency_ms=0.0):
+        row = (time.time(), kind, session, word, category, attempt, points, latency_ms)
+        with self._lock:
+            self._buffer.append(row)
+            self.logged += 1
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def _work(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError:
+                pass  # disk trouble: these events are lost, the game carries on
+
+    def _flush_at_exit(self):
+        try:
+            self.flush()
+        except OSError:
+            pass  # log directory gone (e.g. a temporary one already cleaned up)
+
+    def flush(self):
+        """Write buffered events as one segment; returns how many."""
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+            self.segments += bool(rows)
+            n = self.segments
+        if not rows:
+            return 0
+        import numpy as np
+
+        columns = {name: np.array(values, dtype=dtype) for (name, dtype), values in zip(COLUMNS, zip(*rows))}
+        name = f"events-{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{os.getpid()}-{n}"
+        tmp = os.path.join(self.directory, f".{name}.npz")
+        np.savez(tmp, **columns)
+        os.replace(tmp, os.path.join(self.directory, f"{name}.npz"))
+        with self._lock:
+            self.written += len(rows)
+        self._prune()
+        return len(rows)
+
+    def _prune(self):
+        cutoff = time.time() - self.keep_days * 86400
+        for path in glob.glob(os.path.join(self.directory, "events-*.npz")):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass  # another process pruned it first
+
+    def stats(self):
+        return {"buffered": len(self._buffer), "logged": self.logged, "written": self.written,
+                "segments": self.segments}
+
+
+@lru_cache(maxsize=None)
+def load_event_log(directory=EVENTS_DIR):
+    """Open the event log under directory and start its writer thread, once per process."""
+    log = EventLog(directory)
+    metrics.register("events", log.stats)
+    return log
+
+
+def read_events(directory=EVENTS_DIR):
+    """Every written event as a DataFrame with one column per COLUMNS entry, oldest first."""
+    import numpy as np
+    import pandas as pd
+
+    parts = {name: [] for name, _ in COLUMNS}
+    for path in sorted(glob.glob(os.path.join(directory, "events-*.npz"))):
+        with np.load(path) as segment:
+            for name, _ in COLUMNS:
+                parts[name].append(segment[name])
+    frame = pd.DataFrame({name: np.concatenate(parts[name]) if parts[name] else np.zeros(0, dtype=dtype)
+                          for name, dtype in COLUMNS})
+    frame["ts"] = pd.to_datetime(frame["ts"], unit="s")
+    for name in ("kind", "word", "category"):
+        frame[name] = frame[name].astype("category")
+    return frame.sort_values("ts", kind="stable", ignore_index=True)
+
+
+# ---------------------------
+# Analytics — vectorized over a read_events() frame
+# ---------------------------
+def rounds(frame):
+    """One row per finished round (its "win" or "loss" event) with a boolean won column."""
+    ended = frame[frame["kind"].isin(["win", "loss"])]
+    return ended.assign(won=ended["kind"].eq("win"))
+
+
+def win_rates(frame, by):
+    """Rounds, win rate and mean attempts used, grouped by a column such as "word" or "category"."""
+    return (rounds(frame).groupby(by, observed=True)
+            .agg(rounds=("won", "size"), win_rate=("won", "mean"), attempts=("attempt", "mean"))
+            .sort_values("rounds", ascending=False))
+
+
+def attempt_rates(frame):
+    """Per attempt number: rounds that reached it, wins on it, and the win rate among those rounds."""
+    ended = rounds(frame)
+    last  = ended["attempt"].value_counts().sort_index()
+    reached = last[::-1].cumsum()[::-1]
+    wins = ended.loc[ended["won"], "attempt"].value_counts().reindex(reached.index, fill_value=0)
+    table = reached.to_frame("reached").assign(wins=wins)
+    return table.assign(win_rate=table["wins"] / table["reached"]).rename_axis("attempt")
+
+
+def latency_percentiles(frame):
+    """p50 / p95 / p99 of guess latency in ms by event kind."""
+    guesses = frame[frame["kind"].ne("start")]
+    return (guesses.groupby("kind", observed=True)["latency_ms"]
+            .quantile([0.5, 0.95, 0.99]).unstack().rename(columns={0.5: "p50", 0.95: "p95", 0.99: "p99"}))
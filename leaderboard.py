@@ -0,0 +1,140 @@
+"""Global leaderboard.
+
+Scores live in a local SQLite file (WAL mode, so readers in other processes
+aren't blocked by the writer), one row per player holding their best
+session total, with an index on score. Submissions only update an
+in-memory buffer that keeps each player's highest pending score; a
+daemon thread writes the buffer in one transaction every flush_interval
+seconds, or sooner once it holds batch_size players. Top-K and rank
+queries walk the score index and are cached process-wide for a few
+seconds, so a burst of finished rounds costs a handful of writes and
+queries rather than one of each per player.
+
+LEADERBOARD_PATH moves the SQLite file.
+"""
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+import metrics
+
+LEADERBOARD_PATH = os.environ.get("LEADERBOARD_PATH") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "leaderboard.sqlite")
+
+
+class Leaderboard:
+    def __init__(self, path=LEADERBOARD_PATH, flush_interval=2.0, batch_size=500, ttl=5.0):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.ttl = ttl
+        self.submitted = self.flushes = self.written = self.cache_hits = self.queries = 0
+        self._buffer = {}  # player -> (name, score) waiting to be written
+        self._cache  = {}  # query key -> (result, expiry)
+        self._lock   = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._wake   = threading.Event()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS scores (player TEXT PRIMARY KEY, name TEXT NOT NULL, "
+            "score INTEGER NOT NULL, updated REAL NOT NULL DEFAULT (julianday('now')))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, updated)")
+        threading.Thread(target=self._work, name="leaderboard-flush", daemon=True).start()
+        atexit.register(self.flush)
+
+    def submit(self, player, name, score):
+        """Queue score for player; only their best pending score is kept."""
+        with self._lock:
+            pending = self._buffer.get(player)
+            if pending is None or score > pending[1]:
+                self._buffer[player] = (name, score)
+            self.submitted += 1
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def _work(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass  # keep the buffer's scores for the next flush
+
+    def flush(self):
+        """Write buffered scores in one transaction; a player's stored score never goes down."""
+        with self._lock:
+            batch, self._buffer = self._buffer, {}
+        if not batch:
+            return 0
+        rows = [(player, name, score) for player, (name, score) in batch.items()]
+        try:
+            with self._db_lock:
+                self._db.execute("BEGIN")
+                self._db.executemany(
+                    "INSERT INTO scores (player, name, score) VALUES (?, ?, ?) "
+                    "ON CONFLICT(player) DO UPDATE SET name = excluded.name, score = excluded.score, "
+                    "updated = julianday('now') WHERE excluded.score > scores.score",
+                    rows,
+                )
+                self._db.execute("COMMIT")
+        except sqlite3.Error:
+            with self._db_lock:
+                if self._db.in_transaction:
+                    self._db.execute("ROLLBACK")
+            with self._lock:
+                for player, (name, score) in batch.items():
+                    pending = self._buffer.get(player)
+                    if pending is None or score > pending[1]:
+                        self._buffer[player] = (name, score)
+            raise
+        with self._lock:
+            self.flushes += 1
+            self.written += len(rows)
+        return len(rows)
+
+    def _cached(self, key, query):
+        now = time.monotonic()
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None and hit[1] > now:
+                self.cache_hits += 1
+                return hit[0]
+        with self._db_lock:
+            result = query()
+        with self._lock:
+            self.queries += 1
+            if len(self._cache) > 1024:
+                self._cache = {k: v for k, v in self._cache.items() if v[1] > now}
+            self._cache[key] = (result, now + self.ttl)
+        return result
+
+    def top(self, k=10):
+        """The k best (name, score) rows, highest first; up to ttl seconds stale."""
+        return self._cached(("top", k), lambda: self._db.execute(
+            "SELECT name, score FROM scores ORDER BY score DESC, updated LIMIT ?", (k,)).fetchall())
+
+    def rank(self, score):
+        """1-based position score would hold, and the number of ranked players (at least that position)."""
+        def query():
+            position = self._db.execute("SELECT COUNT(*) FROM scores WHERE score > ?", (score,)).fetchone()[0] + 1
+            return position, max(position, self._db.execute("SELECT COUNT(*) FROM scores").fetchone()[0])
+        return self._cached(("rank", score), query)
+
+    def stats(self):
+        return {"buffered": len(self._buffer), "submitted": self.submitted, "flushes": self.flushes,
+                "written": self.written, "queries": self.queries, "cache_hits": self.cache_hits}
+
+
+@lru_cache(maxsize=None)
+def load_leaderboard(path=LEADERBOARD_PATH):
+    """Open the leaderboard at path and start its flush thread, once per process."""
+    board = Leaderboard(path)
+    metrics.register("leaderboard", board.stats)
+    return board
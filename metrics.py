@@ -0,0 +1,219 @@
+"""Opt-in hot-path timings, exported in the Prometheus text format.
+
+Timings go into fixed-bucket histograms held in process memory, one per
+metric name and label set. Components with running counters (the lookup
+cache, the dictionary client, the prefetcher) register a stats function
+instead, read only when the metrics are rendered.
+
+Nothing is recorded unless CLUE_METRICS_PORT or CLUE_METRICS_PATH is set
+(or enable() is called). Disabled, timer() hands back one shared no-op
+context manager and timed() returns the function it was given, so the
+instrumented code pays at most an attribute lookup and a call.
+
+    CLUE_METRICS_PORT=9464   serve http://host:9464/metrics from a daemon thread
+    CLUE_METRICS_PATH=f.prom rewrite f.prom every CLUE_METRICS_INTERVAL seconds (default 15)
+"""
+import bisect
+import functools
+import os
+import threading
+import time
+from functools import lru_cache
+
+PREFIX  = "clue_"
+BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+           0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
+
+ENABLED = bool(os.environ.get("CLUE_METRICS_PORT") or os.environ.get("CLUE_METRICS_PATH"))
+
+
+class Histogram:
+    """Counts per bucket plus sum and count, for one metric name and label set."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # the last slot is +Inf
+        self.sum    = 0.0
+        self.count  = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum   += seconds
+        self.count += 1
+
+
+class Registry:
+    def __init__(self):
+        self.histograms = {}  # (name, sorted label items) -> Histogram
+        self.sources    = {}  # name -> callable returning {stat: number}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = Histogram()
+            hist.observe(seconds)
+
+    def render(self):
+        """All histograms and registered stats as Prometheus text."""
+        with self._lock:
+            snapshot = [(name, labels, list(h.counts), h.sum, h.count)
+                        for (name, labels), h in sorted(self.histograms.items())]
+            sources = list(self.sources.items())
+        lines, typed = [], set()
+        for name, labels, counts, total, count in snapshot:
+            metric = f"{PREFIX}{name}_seconds"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} histogram")
+                typed.add(metric)
+            cumulative = 0
+            for le, n in zip(BUCKETS + ("+Inf",), counts):
+                cumulative += n
+                lines.append(f"{metric}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{metric}_sum{_labels(labels)} {total:.9f}")
+            lines.append(f"{metric}_count{_labels(labels)} {count}")
+        for source, stats in sources:
+            for stat, value in stats().items():
+                if isinstance(value, (bool, int, float)):
+                    metric = f"{PREFIX}{source}_{stat}"
+                    lines.append(f"# TYPE {metric} gauge")
+                    lines.append(f"{metric} {float(value):g}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(items):
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+REGISTRY = Registry()
+
+
+class Timer:
+    """Context manager observing the time spent inside it; set() adds labels on the way."""
+
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, labels):
+        self.name   = name
+        self.labels = labels
+
+    def set(self, **labels):
+        self.labels.update(labels)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        REGISTRY.observe(self.name, time.perf_counter() - self.start, self.labels)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def set(self, **labels):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+def timer(name, **labels):
+    """Time a with-block as histogram name (seconds)."""
+    return Timer(name, labels) if ENABLED else NULL_TIMER
+
+
+def timed(name, label=None, **labels):
+    """Decorator timing each call as histogram name.
+
+    With label, the function's return value becomes that label's value,
+    e.g. the outcome of a guess. Returns fn itself when metrics are off.
+    """
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start  = time.perf_counter()
+            result = fn(*args, **kwargs)
+            extra  = {label: result} if label else {}
+            REGISTRY.observe(name, time.perf_counter() - start, {**labels, **extra})
+            return result
+        return wrapper
+    return decorate
+
+
+def register(source, stats):
+    """Export stats() (a dict of numbers) as gauges named after source when rendering."""
+    REGISTRY.sources[source] = stats
+
+
+def render():
+    return REGISTRY.render()
+
+
+def enable():
+    """Turn recording on for code instrumented from now on (benchmarks, tests)."""
+    global ENABLED
+    ENABLED = True
+
+
+def _serve(port):
+    """Serve /metrics on port from a daemon thread; False if the port is taken."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+    except OSError:
+        return False  # another process on this host already serves the port
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return True
+
+
+def _write_loop(path, interval):
+    while True:
+        time.sleep(interval)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(render())
+        os.replace(tmp, path)
+
+
+@lru_cache(maxsize=None)
+def start_export():
+    """Start the endpoint and/or file writer configured in the environment, once per process."""
+    port = os.environ.get("CLUE_METRICS_PORT")
+    path = os.environ.get("CLUE_METRICS_PATH")
+    if port:
+        _serve(int(port))
+    if path:
+        interval = float(os.environ.get("CLUE_METRICS_INTERVAL", 15))
+        threading.Thread(target=_write_loop, args=(path, interval), name="metrics-file", daemon=True).start()
+    return bool(port or path)
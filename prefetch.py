@@ -0,0 +1,99 @@
+"""Background warming of the remote dictionary cache.
+
+When a board is dealt, the words a player might plausibly guess that the
+bundled list can't answer are queued here, and a few daemon threads look
+them up while the player is still reading the clue. Only max_batch words
+per board are queued, so an unusual board can't spend the API's request
+budget, and the queue is bounded: when it is full new words are dropped
+rather than blocking the game.
+Each submission returns a Batch that its session cancels when it leaves
+the board, so words nobody will guess are skipped.
+"""
+import queue
+import threading
+from functools import lru_cache
+
+import metrics
+from dictionary import check_remote, load_cache
+
+
+class Batch:
+    """Words queued for one board; cancel() makes the workers skip the rest."""
+
+    __slots__ = ("cancelled",)
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Prefetcher:
+    def __init__(self, fetch=check_remote, cache=None, workers=4, max_queue=512, max_batch=16):
+        self.fetch = fetch
+        self.max_batch = max_batch
+        self.cache = cache if cache is not None else load_cache()
+        self.submitted = self.dropped = self.skipped = self.fetched = self.errors = self.served = 0
+        self._queue  = queue.Queue(maxsize=max_queue)
+        self._warmed = set()  # words fetched here and not yet guessed
+        self._max_warmed = max_queue * 4
+        self._lock   = threading.Lock()
+        for n in range(workers):
+            threading.Thread(target=self._work, name=f"dict-prefetch-{n}", daemon=True).start()
+
+    def submit(self, words):
+        """Queue words (uppercase) for lookup; returns the Batch to cancel them with."""
+        batch = Batch()
+        queued = 0
+        for word in words:
+            if word in self.cache:
+                continue
+            if queued >= self.max_batch:
+                self.dropped += 1
+                continue
+            queued += 1
+            try:
+                self._queue.put_nowait((batch, word))
+                self.submitted += 1
+            except queue.Full:
+                self.dropped += 1
+        return batch
+
+    def _work(self):
+        while True:
+            batch, word = self._queue.get()
+            if batch.cancelled or word in self.cache:
+                with self._lock:
+                    self.skipped += 1
+                continue
+            try:
+                self.fetch(word)
+            except Exception:
+                with self._lock:
+                    self.errors += 1
+                continue
+            with self._lock:
+                self.fetched += 1
+                if len(self._warmed) >= self._max_warmed:
+                    self._warmed.clear()
+                self._warmed.add(word)
+
+    def note_guess(self, word):
+        """Record that a guess was answered from the cache; counts it if we fetched it."""
+        with self._lock:
+            if word in self._warmed:
+                self._warmed.discard(word)
+                self.served += 1
+
+    def stats(self):
+        return {"queued": self._queue.qsize(), "submitted": self.submitted, "dropped": self.dropped,
+                "skipped": self.skipped, "fetched": self.fetched, "errors": self.errors, "served": self.served}
+
+
+@lru_cache(maxsize=None)
+def load_prefetcher():
+    """Start the process-wide prefetch workers on first use."""
+    prefetcher = Prefetcher()
+    metrics.register("dictionary_prefetch", prefetcher.stats)
+    return prefetcher
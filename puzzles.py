@@ -0,0 +1,323 @@
+"""Precomputed puzzle packs.
+
+A pack is a single file of fixed-width records, memory-mapped read-only so
+every session in the process (and every process on the host) shares the
+same page-cache pages. Picking a puzzle is an index into the mapping.
+
+Layout:
+    b"CLUEPACK" + zero padding up to RECORD_OFFSET
+    records     count x record_dtype(rows, cols)
+    order       count x uint32, record indexes sorted by target word
+    footer      UTF-8 JSON: board size, count, offsets, word and category tables
+    footer length as little-endian uint32, then b"CLUEPACK" again
+
+Version 2 records also carry difficulty metrics for their board: routes
+(distinct paths spelling the target), decoys (other real words of the
+target's length on the board) and ambiguity (mean number of cells holding
+each letter of the target; 1.0 means every step has one candidate).
+
+numpy is imported by the functions that use it, so importing this module
+(and calling load_pack() with no pack on disk) never loads it.
+
+Build one with:  python -m puzzles build data/puzzles.pack --workers 8
+"""
+import argparse
+import json
+import os
+import random
+import struct
+import time
+from array import array
+from functools import lru_cache
+from multiprocessing import Pool
+
+from board import count_paths, generate_boards, solve_board, unflatten
+from dictionary import load_index
+from wordbank import load_bank
+
+MAGIC         = b"CLUEPACK"
+VERSION       = 2
+RECORD_OFFSET = 64
+NO_CELL       = 255  # pads paths shorter than the board
+
+PACK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "puzzles.pack")
+
+
+def record_dtype(rows, cols, version=VERSION):
+    import numpy as np
+
+    size = rows * cols
+    fields = [
+        ("cells",    "u1", (size,)),  # ASCII letters, row-major
+        ("word",     "<u4"),          # index into the footer word table
+        ("category", "<u2"),          # index into the footer category table
+        ("length",   "u1"),
+        ("path",     "u1", (size,)),  # cells spelling the word, NO_CELL padded
+    ]
+    if version >= 2:
+        fields += [
+            ("routes",    "<u2"),  # distinct paths spelling the word, capped at 65535
+            ("decoys",    "<u2"),  # other real words of the same length on the board
+            ("ambiguity", "<f4"),  # mean cells per target letter
+        ]
+    return np.dtype(fields)
+
+
+def difficulty(board, word, index):
+    """(routes, decoys, ambiguity) for word on board; see the module docstring."""
+    cells  = "".join("".join(row) for row in board)
+    routes = count_paths(board, word)
+    decoys = len(solve_board(board, index, len(word), len(word)) - {word})
+    ambiguity = sum(cells.count(letter) for letter in word) / len(word)
+    return min(routes, 0xFFFF), min(decoys, 0xFFFF), ambiguity
+
+
+def _align(n, to=RECORD_OFFSET):
+    return -(-n // to) * to
+
+
+class PackWriter:
+    """Stream puzzle records to a pack file; the word index is written on close.
+
+    Records go to path + ".tmp", which close() finishes and renames over
+    path. Leaving the with-block on an exception calls abort() instead, so a
+    failed build never leaves a pack that looks complete.
+    """
+
+    def __init__(self, path, rows, cols=None):
+        self.path  = path
+        self.rows  = rows
+        self.cols  = cols or rows
+        self.dtype = record_dtype(self.rows, self.cols)
+        self.words, self.categories = [], []
+        self._word_ids, self._category_ids = {}, {}
+        self._targets = array("I")
+        self._tmp  = f"{path}.tmp"
+        self._file = open(self._tmp, "wb")
+        self._file.write(MAGIC.ljust(RECORD_OFFSET, b"\0"))
+
+    def _intern(self, value, table, ids):
+        if value not in ids:
+            ids[value] = len(table)
+            table.append(value)
+        return ids[value]
+
+    def add_batch(self, cells, words, categories, paths, metrics=None):
+        """Append len(words) puzzles with a single write; metrics are (routes, decoys, ambiguity) rows."""
+        import numpy as np
+
+        recs = np.zeros(len(words), dtype=self.dtype)
+        recs["cells"]    = cells
+        recs["word"]     = [self._intern(w, self.words, self._word_ids) for w in words]
+        recs["category"] = [self._intern(c, self.categories, self._category_ids) for c in categories]
+        recs["length"]   = [len(w) for w in words]
+        recs["path"]     = NO_CELL
+        for rec_path, path in zip(recs["path"], paths):
+            rec_path[:len(path)] = path
+        if metrics is not None and len(metrics):
+            routes, decoys, ambiguity = zip(*metrics)
+            recs["routes"], recs["decoys"], recs["ambiguity"] = routes, decoys, ambiguity
+        self._file.write(recs.tobytes())
+        self._targets.extend(recs["word"].tolist())
+
+    def close(self):
+        import numpy as np
+
+        f = self._file
+        count = len(self._targets)
+        targets = np.frombuffer(self._targets, dtype=np.uint32) if count else np.zeros(0, np.uint32)
+        order   = np.argsort(targets, kind="stable").astype("<u4")
+        starts  = np.searchsorted(targets[order], np.arange(len(self.words) + 1)).tolist()
+
+        order_offset = _align(RECORD_OFFSET + count * self.dtype.itemsize)
+        f.write(b"\0" * (order_offset - f.tell()))
+        f.write(order.tobytes())
+        footer = json.dumps({
+            "version": VERSION, "rows": self.rows, "cols": self.cols, "count": count,
+            "record_offset": RECORD_OFFSET, "order_offset": order_offset,
+            "words": self.words, "categories": self.categories, "starts": starts,
+        }).encode("utf-8")
+        f.write(footer)
+        f.write(struct.pack("<I", len(footer)) + MAGIC)
+        f.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        """Drop everything written so far; path is left as it was."""
+        self._file.close()
+        try:
+            os.remove(self._tmp)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class PuzzlePack:
+    """Read-only, memory-mapped view of a pack file."""
+
+    __slots__ = ("rows", "cols", "version", "words", "categories", "records", "order", "_word_ids", "_starts")
+
+    def __init__(self, path):
+        import numpy as np
+
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a puzzle pack")
+            f.seek(-(4 + len(MAGIC)), os.SEEK_END)
+            (footer_len,) = struct.unpack("<I", f.read(4))
+            f.seek(-(4 + len(MAGIC) + footer_len), os.SEEK_END)
+            footer = json.loads(f.read(footer_len))
+        if not 1 <= footer["version"] <= VERSION:
+            raise ValueError(f"{path}: unsupported pack version {footer['version']}")
+
+        self.version = footer["version"]
+        self.rows, self.cols = footer["rows"], footer["cols"]
+        dtype = record_dtype(self.rows, self.cols, self.version)
+        self.words      = footer["words"]
+        self.categories = footer["categories"]
+        self._word_ids  = {w: i for i, w in enumerate(self.words)}
+        self._starts    = footer["starts"]
+        count = footer["count"]
+        if count:
+            self.records = np.memmap(path, dtype=dtype, mode="r",
+                                     offset=footer["record_offset"], shape=(count,))
+            self.order   = np.memmap(path, dtype="<u4", mode="r",
+                                     offset=footer["order_offset"], shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=dtype)
+            self.order   = np.zeros(0, dtype="<u4")
+
+    def __len__(self):
+        return len(self.records)
+
+    def puzzle(self, i):
+        """Decode record i into a level dict with its board and solved path."""
+        rec  = self.records[i]
+        word = self.words[rec["word"]]
+        puzzle = {
+            "word":  word,
+            "clue":  {"length": int(rec["length"]), "category": self.categories[rec["category"]]},
+            "board": unflatten(rec["cells"].tobytes().decode("ascii"), self.cols),
+            "path":  rec["path"][:rec["length"]].tolist(),
+        }
+        if self.version >= 2:
+            puzzle["difficulty"] = {"routes": int(rec["routes"]), "decoys": int(rec["decoys"]),
+                                    "ambiguity": float(rec["ambiguity"])}
+        return puzzle
+
+    def pick(self, word, rng=random):
+        """Return a random puzzle for word, or None if the pack has none."""
+        w = self._word_ids.get(word)
+        if w is None or self._starts[w] == self._starts[w + 1]:
+            return None
+        return self.puzzle(int(self.order[rng.randrange(self._starts[w], self._starts[w + 1])]))
+
+
+@lru_cache(maxsize=None)
+def load_pack(path=PACK_PATH):
+    """Map the pack at path once per process; None if there is no pack."""
+    if not os.path.exists(path):
+        return None
+    return PuzzlePack(path)
+
+
+def _build_chunk(task):
+    """Worker: generate and score boards for one chunk of (word, category) pairs."""
+    import numpy as np
+
+    pairs, rows, seed, weighted = task
+    words = [w for w, _ in pairs]
+    cells, paths = generate_boards(words, rows, rng=np.random.default_rng(seed), weighted=weighted)
+    index = load_index()
+    metrics = [difficulty(unflatten(row.tobytes().decode("ascii"), rows), word, index)
+               for row, word in zip(cells, words)]
+    return pairs, cells, paths, metrics
+
+
+def build_pack(path, levels, rows, per_word, seed=None, weighted=False, workers=None, chunk=2000,
+               progress=None):
+    """Write per_word scored boards for every level ({"word", "clue"}) to path; returns how many.
+
+    Boards are generated and scored in chunks on a process pool and streamed
+    to the pack in order as they come back. A board identical to one already
+    written for the same word is dropped, so the count can come up short.
+    """
+    import numpy as np
+
+    pairs = [(level["word"].upper(), level["clue"]["category"]) for level in levels for _ in range(per_word)]
+    seeds = np.random.SeedSequence(seed).spawn(-(-len(pairs) // chunk))
+    tasks = [(pairs[i:i + chunk], rows, seeds[n], weighted) for n, i in enumerate(range(0, len(pairs), chunk))]
+    seen, written = set(), 0
+    with PackWriter(path, rows) as writer, Pool(workers) as pool:
+        for done, (pairs_, cells, paths, metrics) in enumerate(pool.imap(_build_chunk, tasks), 1):
+            keep = []
+            for i, (word, _) in enumerate(pairs_):
+                key = (word, cells[i].tobytes())
+                if key not in seen:
+                    seen.add(key)
+                    keep.append(i)
+            writer.add_batch(cells[keep], [pairs_[i][0] for i in keep], [pairs_[i][1] for i in keep],
+                             [paths[i] for i in keep], [metrics[i] for i in keep])
+            written += len(keep)
+            if progress:
+                progress(done, len(tasks), written)
+    return written
+
+
+def pack_stats(pack):
+    """Quartiles of each difficulty metric over a version 2 pack."""
+    import numpy as np
+
+    if pack.version < 2 or not len(pack):
+        return {}
+    return {name: np.percentile(pack.records[name], [0, 25, 50, 75, 100]).tolist()
+            for name in ("routes", "decoys", "ambiguity")}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m puzzles", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="generate a pack of boards")
+    build.add_argument("out")
+    build.add_argument("--levels", help='JSON list of {"word", "clue": {"category"}}; defaults to the word bank')
+    build.add_argument("--size", type=int, default=4)
+    build.add_argument("--per-word", type=int, default=64)
+    build.add_argument("--seed", type=int)
+    build.add_argument("--weighted", action="store_true", help="weight filler letters by English frequency")
+    build.add_argument("--workers", type=int, default=os.cpu_count())
+    stats = sub.add_parser("stats", help="show difficulty quartiles of a pack")
+    stats.add_argument("pack")
+    args = parser.parse_args(argv)
+
+    if args.command == "stats":
+        pack = PuzzlePack(args.pack)
+        print(f"{len(pack)} puzzles, {len(pack.words)} words, version {pack.version}")
+        for name, q in pack_stats(pack).items():
+            print(f"{name:<10} " + " ".join(f"{v:8.2f}" for v in q) + "   (min, 25%, median, 75%, max)")
+        return
+
+    if args.levels:
+        with open(args.levels, encoding="utf-8") as f:
+            levels = json.load(f)
+    else:
+        levels = list(load_bank().levels())
+    start = time.perf_counter()
+
+    def progress(done, total, written):
+        print(f"\r{done}/{total} chunks, {written} puzzles", end="", flush=True)
+
+    n = build_pack(args.out, levels, args.size, args.per_word, args.seed, args.weighted, args.workers,
+                   progress=progress)
+    print(f"\nWrote {n} puzzles to {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
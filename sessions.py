@@ -0,0 +1,165 @@
+"""Spilling idle sessions to disk.
+
+Every GameState in the process is registered here by its resume token
+(a secret, unlike the player id) with the time the session last touched it.
+A daemon thread periodically snapshots sessions idle for idle_after
+seconds into a local SQLite store (WAL mode) and spills them: the object
+stays in session_state but drops its board, solutions and history. The
+next touch loads the snapshot back in place. A new browser session that
+carries a token (app.py keeps it in the URL) resumes from the live object
+or the store, so a reconnect picks up where the player left off. The game
+is handed over, not shared: the session it came from starts a fresh game
+on its next touch, so two tabs never write the same snapshot.
+
+SESSIONS_PATH moves the SQLite file.
+"""
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from functools import lru_cache
+
+import metrics
+from state import GameState
+
+SESSIONS_PATH = os.environ.get("SESSIONS_PATH") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "sessions.sqlite")
+
+
+class SessionStore:
+    """Snapshots by token in SQLite; rows not saved for keep_days are pruned on open."""
+
+    def __init__(self, path=SESSIONS_PATH, keep_days=7):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (token TEXT PRIMARY KEY, state BLOB NOT NULL, "
+            "saved REAL NOT NULL DEFAULT (julianday('now')))"
+        )
+        self._db.execute("DELETE FROM sessions WHERE saved < julianday('now') - ?", (keep_days,))
+
+    def put(self, token, data):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO sessions (token, state) VALUES (?, ?)", (token, data))
+
+    def get(self, token):
+        with self._lock:
+            row = self._db.execute("SELECT state FROM sessions WHERE token = ?", (token,)).fetchone()
+        return row[0] if row else None
+
+
+class Sessions:
+    def __init__(self, store, idle_after=60.0, sweep_every=15.0):
+        self.store = store
+        self.idle_after = idle_after
+        self.spills = self.restores = self.resumes = self.errors = 0
+        self._games  = weakref.WeakValueDictionary()  # token -> GameState still held by a session
+        self._active = {}                             # token -> last touch, time.monotonic()
+        self._lock   = threading.Lock()
+        threading.Thread(target=self._sweep_loop, args=(sweep_every,), name="session-spill", daemon=True).start()
+
+    def touch(self, game):
+        """Mark game's session active, loading its snapshot back first if it was spilled.
+
+        A game handed over to another session by resume() is reset to a new
+        player with a new token instead.
+        """
+        if game.handed_over:
+            game.__init__(game.size)
+        token = game.resume_token
+        with self._lock:
+            self._active[token] = time.monotonic()
+            self._games[token] = game  # a resumed copy replaces the object it was copied from
+            if game.spilled:
+                data = self.store.get(token)
+                if data is not None:
+                    game.load_bytes(data)
+                    self.restores += 1
+                else:
+                    # Snapshot lost (store deleted): start over rather than play on an empty board
+                    player_id, player_name = game.player_id, game.player_name
+                    game.__init__(game.size)
+                    game.player_id, game.player_name, game.resume_token = player_id, player_name, token
+        return game
+
+    def resume(self, token):
+        """The state behind token for a new browser session, or None.
+
+        It is built from the live session or the store and replaces that
+        session's object, which is marked handed_over so its holder starts
+        afresh rather than keep playing, and spilling, under the same token.
+        """
+        with self._lock:
+            live = self._games.get(token)
+            data = live.to_bytes() if live is not None and not live.spilled else self.store.get(token)
+            if data is None:
+                return None
+            game = GameState.from_bytes(data)
+            game.assets_sent = False  # a new browser page has none of the assets yet
+            if live is not None:
+                live.handed_over = True
+            self._games[token]  = game
+            self._active[token] = time.monotonic()
+            self.resumes += 1
+        return game
+
+    def _sweep_loop(self, every):
+        while True:
+            time.sleep(every)
+            self._sweep_once()
+
+    def _sweep_once(self):
+        try:
+            self.sweep()
+        except Exception:
+            # Whatever went wrong, the loop must live on: a session whose
+            # snapshot failed stays resident and is retried next sweep
+            with self._lock:
+                self.errors += 1
+
+    def sweep(self):
+        """Snapshot and spill every session idle for idle_after seconds; returns how many.
+
+        Snapshots are taken under the lock but written after it is released,
+        so touch() never waits on SQLite. A session touched in between is
+        left resident; its snapshot is written anyway and simply overwritten
+        by a later sweep.
+        """
+        cutoff = time.monotonic() - self.idle_after
+        idle = []
+        with self._lock:
+            for token, seen in list(self._active.items()):
+                game = self._games.get(token)
+                if game is None:
+                    del self._active[token]  # session gone; its snapshot (if any) stays in the store
+                    continue
+                if seen > cutoff or game.spilled or game.pending:
+                    continue
+                idle.append((token, seen, game, game.to_bytes()))
+        spilled = 0
+        for token, seen, game, data in idle:
+            self.store.put(token, data)
+            with self._lock:
+                # Spill only if nothing touched or replaced the session while the snapshot was written
+                if self._active.get(token) == seen and self._games.get(token) is game:
+                    game.spill()
+                    del self._active[token]
+                    spilled += 1
+        with self._lock:
+            self.spills += spilled
+        return spilled
+
+    def stats(self):
+        return {"sessions": len(self._games), "active": len(self._active), "spills": self.spills,
+                "restores": self.restores, "resumes": self.resumes, "errors": self.errors}
+
+
+@lru_cache(maxsize=None)
+def load_sessions(path=SESSIONS_PATH):
+    """Open the session store at path and start the spill thread, once per process."""
+    sessions = Sessions(SessionStore(path))
+    metrics.register("sessions", sessions.stats)
+    return sessions
@@ -0,0 +1,181 @@
+"""Bot-play simulator for tuning the game rules.
+
+Plays games with the real engine (engine.py) against freshly generated
+boards, spread over a process pool, for every combination of rules given
+on the command line, and reports win rate, attempt distribution and score
+per word for each.
+
+A bot is a crude player model. It knows each word traceable on the board
+(target included) with probability vocab. On every guess it names the
+target if it knows it and spots it, with probability skill, raised by
+clue_boost for every clue already revealed. Otherwise it tries an unguessed
+bonus word it knows with probability explore, and if not, makes a wrong
+guess that costs an attempt.
+
+Run from the repo root:
+    python -m simulate --games 200000 --max-attempts 2,3,4 --score-map 10,5,3 --score-map 10,6,3,1
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import string
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+import engine
+from board import generate_boards, unflatten
+from dictionary import load_index
+from state import GameState
+from wordbank import load_bank
+
+CHUNK = 2000  # games per task sent to a worker
+
+
+class Bot:
+    __slots__ = ("skill", "vocab", "explore", "clue_boost")
+
+    def __init__(self, skill=0.35, vocab=0.6, explore=0.5, clue_boost=0.5):
+        self.skill      = skill
+        self.vocab      = vocab
+        self.explore    = explore
+        self.clue_boost = clue_boost
+
+    def play(self, game, rules, rng):
+        """Guess until the round on game is over; returns the points scored."""
+        target = game.target
+        start  = game.total_score
+        knows_target = rng.random() < self.vocab
+        known = [w for w in sorted(game.solutions) if w != target and rng.random() < self.vocab]
+        rng.shuffle(known)
+        while game.stage == "game":
+            clues = sum(game.attempts >= a for a in rules.clue_after)
+            if knows_target and rng.random() < self.skill * (1 + self.clue_boost * clues):
+                guess = target
+            elif known and rng.random() < self.explore:
+                guess = known.pop()
+            else:
+                guess = "".join(rng.choice(string.ascii_uppercase) for _ in target)
+            checked = engine.check_guess(game, guess, rules)
+            if checked is not None:
+                engine.judge_guess(game, *checked, rules=rules)
+        return game.total_score - start
+
+
+def play_chunk(task):
+    """Worker: play games games under one rules/bot setting; returns summed counters."""
+    rules_kwargs, bot_kwargs, games, seed = task
+    rules = engine.Rules(**rules_kwargs)
+    bot   = Bot(**bot_kwargs)
+    rng   = random.Random(seed)
+    bank, index = load_bank(), load_index()
+    game  = GameState(rules.board_size)
+
+    levels = [engine.pick_unused_word(game, bank, rng) for _ in range(games)]
+    cells, _ = generate_boards([lv["word"] for lv in levels], rules.board_size,
+                               rng=np.random.default_rng(seed))
+    totals = {"games": 0, "wins": 0, "points": 0, "bonus_found": 0, "bonus_possible": 0,
+              "wins_by_attempt": [0] * (rules.max_attempts + 1)}
+    for level, row in zip(levels, cells):
+        engine.deal(game, level, unflatten(row.tobytes().decode("ascii"), rules.board_size), index)
+        totals["points"] += bot.play(game, rules, rng)
+        entry = game.history.pop()
+        totals["games"] += 1
+        totals["bonus_found"]    += entry["bonus_words"]
+        totals["bonus_possible"] += entry["bonus_possible"]
+        if entry["result"] == "win":
+            totals["wins"] += 1
+            totals["wins_by_attempt"][entry["attempts"]] += 1
+    return rules_kwargs, totals
+
+
+def simulate(settings, bot_kwargs, games, workers=None, seed=0):
+    """Play games games for each rules setting (a dict of Rules kwargs); returns one summary per setting."""
+    tasks = []
+    for n, rules_kwargs in enumerate(settings):
+        for start in range(0, games, CHUNK):
+            tasks.append((rules_kwargs, bot_kwargs, min(CHUNK, games - start), seed + n * 1_000_003 + start))
+    merged = {}
+    with Pool(workers) as pool:
+        for rules_kwargs, totals in pool.imap_unordered(play_chunk, tasks):
+            key = json.dumps(rules_kwargs, sort_keys=True)
+            if key not in merged:
+                merged[key] = (rules_kwargs, totals)
+                continue
+            acc = merged[key][1]
+            for name, value in totals.items():
+                if isinstance(value, list):
+                    acc[name] = [a + b for a, b in zip(acc[name], value)]
+                else:
+                    acc[name] += value
+    return [summarize(rules_kwargs, totals) for rules_kwargs, totals in merged.values()]
+
+
+def summarize(rules_kwargs, totals):
+    games = totals["games"]
+    return {
+        "rules":            rules_kwargs,
+        "games":            games,
+        "win_rate":         totals["wins"] / games,
+        "points_per_word":  totals["points"] / games,
+        "bonus_found_rate": totals["bonus_found"] / max(1, totals["bonus_possible"]),
+        "wins_by_attempt":  [n / games for n in totals["wins_by_attempt"][1:]],
+    }
+
+
+def _ints(text):
+    return [int(x) for x in text.split(",") if x]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m simulate", description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=100_000, help="games per rules setting")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-attempts", default=str(engine.MAX_ATTEMPTS), help="comma-separated values to try")
+    parser.add_argument("--score-map", action="append",
+                        help="points for attempt 1,2,...; repeat to compare several")
+    parser.add_argument("--clue-after", action="append",
+                        help="wrong attempts before the starting / middle letter clue, e.g. 1,2; repeatable")
+    parser.add_argument("--bonus-points", default=str(engine.BONUS_POINTS), help="comma-separated values to try")
+    parser.add_argument("--skill", type=float, default=0.35)
+    parser.add_argument("--vocab", type=float, default=0.6)
+    parser.add_argument("--explore", type=float, default=0.5)
+    parser.add_argument("--clue-boost", type=float, default=0.5)
+    parser.add_argument("--json", help="also write the summaries to this file")
+    args = parser.parse_args(argv)
+
+    score_maps = [_ints(s) for s in args.score_map or [",".join(map(str, engine.SCORE_MAP.values()))]]
+    clue_afters = [_ints(s) for s in args.clue_after or [",".join(map(str, engine.CLUE_AFTER))]]
+    settings = [
+        {"max_attempts": attempts, "score_map": {i + 1: p for i, p in enumerate(points)},
+         "clue_after": list(clue_after), "bonus_points": bonus}
+        for attempts, points, clue_after, bonus in itertools.product(
+            _ints(args.max_attempts), score_maps, clue_afters, _ints(args.bonus_points))
+    ]
+    bot_kwargs = {"skill": args.skill, "vocab": args.vocab, "explore": args.explore, "clue_boost": args.clue_boost}
+
+    start = time.perf_counter()
+    summaries = simulate(settings, bot_kwargs, args.games, args.workers, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'attempts':>8} {'score map':<14} {'clues':<6} {'bonus':>5} {'win %':>6} "
+          f"{'pts/word':>8} {'bonus %':>7}  wins by attempt %")
+    for s in sorted(summaries, key=lambda s: json.dumps(s["rules"], sort_keys=True)):
+        r = s["rules"]
+        by_attempt = " ".join(f"{100 * x:5.1f}" for x in s["wins_by_attempt"])
+        print(f"{r['max_attempts']:8d} {','.join(map(str, r['score_map'].values())):<14} "
+              f"{','.join(map(str, r['clue_after'])):<6} {r['bonus_points']:5d} {100 * s['win_rate']:6.1f} "
+              f"{s['points_per_word']:8.2f} {100 * s['bonus_found_rate']:7.1f}  {by_attempt}")
+    total = sum(s["games"] for s in summaries)
+    print(f"{total} games in {elapsed:.1f}s ({total / elapsed * 60:,.0f} games/min)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summaries, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""Per-session game state.
+
+Everything a session needs between reruns lives on one GameState object
+stored under a single session_state key. The board is a flat ASCII byte
+string (row-major, like board.flatten) and the tile selection is a bitmask
+plus the selected cell indexes in order, so "is this cell selected / the
+tip / blocked" is a couple of bit operations against the board's
+precomputed neighbor masks.
+
+to_bytes / load_bytes give a compact binary snapshot of everything that
+outlives a rerun, so an idle session can be spilled to disk and brought
+back (see sessions.py). Work in flight (pending checks, prefetch) is not
+part of the snapshot.
+
+player_id is the session's public identity (leaderboard row, event log);
+resume_token is a separate secret that names its snapshot and goes in the
+URL, so neither a leaderboard nor the event log can be used to take over a
+session.
+"""
+import secrets
+import struct
+import uuid
+
+from board import neighbor_masks, unflatten
+
+
+class GameState:
+    __slots__ = (
+        "stage", "attempts", "cells", "size", "target", "clue", "solutions",
+        "history", "wins", "losses", "guess_key", "last_msg", "bank_cursor", "total_score",
+        "feedback", "words_played", "path", "selected", "bonus_words",
+        "pending", "prefetch", "rerun_app", "assets_sent", "confetti", "player_id", "player_name",
+        "resume_token", "daily", "spilled", "handed_over", "_neighbors", "__weakref__",
+    )
+
+    def __init__(self, size=4):
+        self.stage        = "home"
+        self.attempts     = 0
+        self.cells        = b""
+        self.size         = size
+        self.target       = ""
+        self.clue         = {}
+        self.solutions    = frozenset()  # real words traceable on the board
+        self.history      = []
+        self.wins         = 0            # running counts of history results, kept by engine.go_result
+        self.losses       = 0
+        self.guess_key    = 0
+        self.last_msg     = None
+        self.bank_cursor  = (None, 0)    # (shuffle seed, position) into the word bank
+        self.total_score  = 0
+        self.feedback     = None
+        self.words_played = 0
+        self.path         = bytearray()  # selected cell indexes in selection order
+        self.selected     = 0            # the same cells as a bitmask
+        self.bonus_words  = set()        # bonus words found this round
+        self.pending      = []           # (guess, solved, traceable, Future or None, submitted), judged in order
+        self.prefetch     = None         # prefetch.Batch warming the dictionary for this board
+        self.rerun_app    = False        # a board callback changed state outside the board fragment
+        self.assets_sent  = False        # CSS and scripts already installed in this browser session
+        self.confetti     = False        # a win is waiting for its confetti burst
+        self.player_id    = uuid.uuid4().hex  # leaderboard identity for this session
+        self.player_name  = f"Player {self.player_id[:4].upper()}"
+        self.resume_token = secrets.token_hex(16)  # secret key of this session's snapshot, kept in the URL
+        self.daily        = ""           # date of the last daily puzzle dealt, "YYYY-MM-DD"
+        self.spilled      = False        # contents moved to the session store; load_bytes brings them back
+        self.handed_over  = False        # another browser session resumed this one; this holder starts over
+        self._neighbors   = neighbor_masks(size, size)
+
+    # ── Board ──
+    def set_board(self, board):
+        """Store a board given as rows of letters or a flat row-major string."""
+        flat = board if isinstance(board, str) else "".join("".join(row) for row in board)
+        if len(flat) != self.size * self.size:
+            raise ValueError(f"Expected {self.size * self.size} cells, got {len(flat)}")
+        self.cells = flat.encode("ascii")
+
+    @property
+    def flat(self):
+        return self.cells.decode("ascii")
+
+    @property
+    def board(self):
+        """The board as rows of letters, for the board search helpers."""
+        return unflatten(self.flat, self.size)
+
+    def letter(self, i):
+        return chr(self.cells[i])
+
+    def cancel_prefetch(self):
+        if self.prefetch is not None:
+            self.prefetch.cancel()
+            self.prefetch = None
+
+    # ── Selection ──
+    def is_selected(self, i):
+        return self.selected >> i & 1 == 1
+
+    def is_tip(self, i):
+        return bool(self.path) and self.path[-1] == i
+
+    def is_blocked(self, i):
+        """Not selectable: off the tip's neighbors and not already part of the selection."""
+        return bool(self.path) and not (self.selected | self._neighbors[self.path[-1]]) >> i & 1
+
+    def toggle(self, i):
+        """Apply a tap on cell i; returns True if the selection changed.
+
+        Tapping the tip deselects it, tapping another selected cell does
+        nothing, and a free cell is added if it is the first or touches the tip.
+        """
+        if self.path and self.path[-1] == i:
+            self.path.pop()
+            self.selected &= ~(1 << i)
+            return True
+        if self.is_selected(i) or self.is_blocked(i):
+            return False
+        self.path.append(i)
+        self.selected |= 1 << i
+        return True
+
+    def is_path(self, path):
+        """Whether path (cell indexes) could have been tapped: each cell on the
+        board, none twice, and each after the first touching the one before.
+        """
+        seen, prev = 0, None
+        for i in path:
+            if not (type(i) is int and 0 <= i < len(self.cells)) or seen >> i & 1:
+                return False
+            if prev is not None and not self._neighbors[prev] >> i & 1:
+                return False
+            seen |= 1 << i
+            prev = i
+        return True
+
+    def clear_selection(self):
+        self.path = bytearray()
+        self.selected = 0
+
+    def selected_word(self):
+        return bytes(self.cells[i] for i in self.path).decode("ascii")
+
+    # ── Snapshots ──
+    def to_bytes(self):
+        """Compact binary snapshot of the state (see load_bytes)."""
+        seed, position = self.bank_cursor
+        flags = ((seed is not None) | self.assets_sent << 1 | self.confetti << 2 | self.rerun_app << 3)
+        out = bytearray(_HEADER.pack(
+            SNAPSHOT_VERSION, STAGES.index(self.stage), self.size, self.attempts, flags,
+            self.words_played, self.guess_key, self.total_score, position, seed or 0, self.selected,
+            self.clue.get("length", 0), len(self.history),
+        ))
+        out += bytes.fromhex(self.player_id) + bytes.fromhex(self.resume_token)
+        for text in (self.cells.decode("ascii"), bytes(self.path).decode("latin-1"), self.target,
+                     self.clue.get("category", ""), self.player_name,
+                     *(self.last_msg or ("", "")), *(self.feedback or ("", "")),
+                     "\n".join(sorted(self.solutions)), "\n".join(sorted(self.bonus_words)), self.daily):
+            _put_str(out, text)
+        for h in self.history:
+            out += _HISTORY.pack(h["result"] == "win", h["attempts"], h.get("points", 0),
+                                 h.get("bonus_words", 0), h.get("bonus_possible", 0))
+            _put_str(out, h["word"])
+        return bytes(out)
+
+    def load_bytes(self, data):
+        """Restore this object from a to_bytes snapshot, in place."""
+        (version, stage, size, self.attempts, flags, self.words_played, self.guess_key, self.total_score,
+         position, seed, self.selected, length, entries) = _HEADER.unpack_from(data)
+        if not 1 <= version <= SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported game state snapshot version {version}")
+        offset = _HEADER.size
+        self.player_id = data[offset:offset + 16].hex()
+        offset += 16
+        if version >= 3:
+            self.resume_token = data[offset:offset + 16].hex()
+            offset += 16
+        else:
+            self.resume_token = secrets.token_hex(16)  # before version 3 the URL held the player id
+        texts = []
+        for _ in range(11 if version == 1 else 12):  # version 1 had no daily date
+            text, offset = _get_str(data, offset)
+            texts.append(text)
+        cells, path, self.target, category, self.player_name, msg_type, msg, fb_type, fb, solutions, bonus = texts[:11]
+        self.daily = texts[11] if version > 1 else ""
+        self.history = []
+        for _ in range(entries):
+            win, attempts, points, bonus_words, bonus_possible = _HISTORY.unpack_from(data, offset)
+            word, offset = _get_str(data, offset + _HISTORY.size)
+            self.history.append({"word": word, "result": "win" if win else "loss", "attempts": attempts,
+                                 "points": points, "bonus_words": bonus_words, "bonus_possible": bonus_possible})
+        self.wins   = sum(h["result"] == "win" for h in self.history)
+        self.losses = entries - self.wins
+
+        self.stage       = STAGES[stage]
+        self.size        = size
+        self.cells       = cells.encode("ascii")
+        self.path        = bytearray(path.encode("latin-1"))
+        self.clue        = {"length": length, "category": category} if length else {}
+        self.solutions   = frozenset(solutions.split("\n")) if solutions else frozenset()
+        self.bonus_words = set(bonus.split("\n")) if bonus else set()
+        self.last_msg    = (msg_type, msg) if msg_type else None
+        self.feedback    = (fb_type, fb) if fb_type else None
+        self.bank_cursor = (seed if flags & 1 else None, position)
+        self.assets_sent = bool(flags & 2)
+        self.confetti    = bool(flags & 4)
+        self.rerun_app   = bool(flags & 8)
+        self.pending     = []
+        self.prefetch    = None
+        self.spilled     = False
+        self.handed_over = False
+        self._neighbors  = neighbor_masks(size, size)
+        return self
+
+    @classmethod
+    def from_bytes(cls, data):
+        game = cls.__new__(cls)
+        return game.load_bytes(data)
+
+    def spill(self):
+        """Drop everything a snapshot can restore, keeping only the ids; marks the state spilled."""
+        self.cancel_prefetch()
+        self.cells, self.path, self.target, self.clue = b"", bytearray(), "", {}
+        self.solutions, self.bonus_words, self.history = frozenset(), set(), []
+        self.last_msg = self.feedback = None
+        self.spilled = True
+
+
+SNAPSHOT_VERSION = 3  # 2 added the daily date, 3 the resume token
+STAGES   = ("home", "game", "result", "subscribe")
+# version, stage, size, attempts, flags, words played, guess key, total score,
+# bank position, bank seed, selection mask, clue length, history entries
+_HEADER  = struct.Struct("<BBBBBIIiIQQBI")
+# won, attempts, points, bonus words found, bonus words possible
+_HISTORY = struct.Struct("<?BHHH")
+
+
+def _put_str(out, text):
+    raw = text.encode("utf-8")
+    out += struct.pack("<I", len(raw))
+    out += raw
+
+
+def _get_str(data, offset):
+    (n,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    return bytes(data[offset:offset + n]).decode("utf-8"), offset + n
@@ -0,0 +1,98 @@
+"""DictionaryClient request coalescing and circuit breaker, against bench.stubdict."""
+import threading
+import time
+
+import pytest
+
+from bench.stubdict import stub_dictionary
+from dictionary import DictionaryClient
+
+RESET_AFTER = 0.3
+DELAY = 0.2
+
+
+class Stub:
+    def __init__(self, url, requested, outage):
+        self.client = DictionaryClient(url, timeout=2, failure_threshold=3, reset_after=RESET_AFTER)
+        self.requested = requested
+        self.outage = outage
+
+    def open_breaker(self):
+        """Take the API down and fail failure_threshold lookups in a row."""
+        self.outage.set()
+        return [self.client.lookup(w) for w in ("AAS", "BBS", "CCS")]
+
+
+@pytest.fixture
+def stub():
+    outage = threading.Event()
+    with stub_dictionary(delay=DELAY, status=lambda word: 503 if outage.is_set() else None) as (url, requested):
+        yield Stub(url, requested, outage)
+
+
+def concurrently(fn, args):
+    results = [None] * len(args)
+
+    def run(i):
+        results[i] = fn(args[i])
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(args))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_lookups_of_one_word_share_a_request(stub):
+    results = concurrently(stub.client.lookup, ["RUNNING"] * 10)
+    assert results == [(True, True)] * 10
+    assert stub.requested.count("running") == 1
+    assert stub.client.coalesced == 9
+
+
+def test_answers_are_verified(stub):
+    assert stub.client.lookup("JUMPED") == (True, True)
+    assert stub.client.lookup("XYZZY") == (False, True)
+
+
+def test_failures_in_a_row_open_the_breaker(stub):
+    # Unverified lookups fail open: the word is accepted
+    assert stub.open_breaker() == [(True, False)] * 3
+    assert stub.client.open
+    assert len(stub.requested) == 3
+
+
+def test_open_breaker_short_circuits(stub):
+    stub.open_breaker()
+    before = len(stub.requested)
+    start = time.perf_counter()
+    assert stub.client.lookup("DDS") == (True, False)
+    assert time.perf_counter() - start < DELAY
+    assert len(stub.requested) == before
+    assert stub.client.short_circuited == 1
+
+
+def test_failed_half_open_probe_reopens(stub):
+    stub.open_breaker()
+    time.sleep(RESET_AFTER * 1.2)
+    before = len(stub.requested)
+
+    # One probe goes out; a lookup while it is in flight still fails fast
+    probe = threading.Thread(target=stub.client.lookup, args=("EES",))
+    probe.start()
+    time.sleep(DELAY / 4)
+    assert stub.client.lookup("FFS") == (True, False)
+    probe.join()
+    assert len(stub.requested) - before == 1
+    assert stub.client.short_circuited == 1
+    assert stub.client.open
+
+
+def test_good_half_open_probe_closes(stub):
+    stub.open_breaker()
+    stub.outage.clear()
+    time.sleep(RESET_AFTER * 1.2)
+    assert stub.client.lookup("GGS") == (True, True)
+    assert not stub.client.open
+    assert stub.client.stats()["failures"] == 0
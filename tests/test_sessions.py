@@ -0,0 +1,74 @@
+"""Session spilling, resuming and handing over (sessions.py)."""
+import pytest
+
+from sessions import Sessions, SessionStore
+from state import GameState
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    # idle_after=0: every sweep spills whatever isn't touched in between
+    return Sessions(SessionStore(str(tmp_path / "sessions.sqlite")), idle_after=0, sweep_every=3600)
+
+
+def test_spill_and_touch_restores(sessions):
+    game = GameState(4)
+    game.total_score = 10
+    sessions.touch(game)
+    assert sessions.sweep() == 1 and game.spilled
+    sessions.touch(game)
+    assert not game.spilled and game.total_score == 10
+
+
+def test_duplicated_tab_takes_over_instead_of_forking(sessions):
+    tab_a = GameState(4)
+    tab_a.total_score = 10
+    sessions.touch(tab_a)
+    assert sessions.sweep() == 1
+
+    # A second tab opens the same ?session= URL, plays on and is spilled in turn
+    tab_b = sessions.resume(tab_a.resume_token)
+    sessions.touch(tab_b)
+    assert tab_b.total_score == 10 and tab_b.player_id == tab_a.player_id
+    tab_b.total_score = 99
+    tab_b.history.append({"word": "STONE", "result": "win", "attempts": 1, "points": 99})
+    assert sessions.sweep() == 1
+
+    # The original tab must not pick up B's snapshot; it starts a new game under a new token
+    old_token = tab_a.resume_token
+    sessions.touch(tab_a)
+    assert tab_a.total_score == 0 and tab_a.history == []
+    assert tab_a.resume_token != old_token and tab_a.player_id != tab_b.player_id
+
+    sessions.touch(tab_b)
+    assert tab_b.total_score == 99 and len(tab_b.history) == 1
+    # A's fresh game spilling doesn't touch B's row
+    sessions.sweep()
+    assert GameState.from_bytes(sessions.store.get(old_token)).total_score == 99
+
+
+def test_resume_unknown_token(sessions):
+    assert sessions.resume("0" * 32) is None
+
+
+def test_resume_token_is_not_the_player_id():
+    game = GameState(4)
+    assert game.resume_token != game.player_id
+    copy = GameState.from_bytes(game.to_bytes())
+    assert (copy.player_id, copy.resume_token) == (game.player_id, game.resume_token)
+
+
+def test_sweep_errors_are_counted_and_the_loop_survives(sessions, monkeypatch):
+    game = GameState(4)
+    sessions.touch(game)
+
+    def broken(self):
+        raise RuntimeError("snapshot failed")
+
+    monkeypatch.setattr(GameState, "to_bytes", broken)
+    sessions._sweep_once()
+    assert sessions.stats()["errors"] == 1 and not game.spilled
+
+    monkeypatch.undo()
+    sessions._sweep_once()
+    assert game.spilled and sessions.stats()["errors"] == 1
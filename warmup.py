@@ -0,0 +1,105 @@
+"""Warm-up before a server admits traffic.
+
+Everything a first session would otherwise pay for inside its own request
+(importing the game modules, reading the word list and word bank, mapping
+the puzzle pack, solving today's daily puzzle, opening the SQLite stores,
+rendering the loader assets) goes through the same lru_cached load_*()
+functions app.py calls, so running them once here leaves every cache
+filled for the process. Importing the game modules loads none of numpy,
+requests or pandas; each is imported where it is first used. Warm-up
+loads numpy on purpose, since dealing a board needs it: the pack step maps
+the pack with it, and the daily step generates a board with it when there
+is no pack. requests (dictionary fallback) and pandas (analytics page) are
+left until a session needs them.
+
+Start the app through it so the port is only bound once warm-up is done:
+
+    python -m warmup run app.py [streamlit options]
+
+warm_up() can also be called from any other entrypoint; it returns the
+seconds each step took.
+"""
+import sys
+import time
+
+
+def _assets():
+    from assets import loader_html
+    loader_html()
+
+
+def _index():
+    from dictionary import load_cache, load_index
+    load_index()
+    load_cache()
+
+
+def _bank():
+    from wordbank import load_bank
+    load_bank()
+
+
+def _pack():
+    from puzzles import load_pack
+    load_pack()
+
+
+def _daily():
+    from daily import load_daily, today
+    from engine import BOARD_SIZE
+    load_daily(today(), BOARD_SIZE)  # same cache key as app.start_daily_game
+
+
+def _stores():
+    from events import load_event_log
+    from leaderboard import load_leaderboard
+    from sessions import load_sessions
+    load_leaderboard()
+    load_sessions()
+    load_event_log()
+
+
+def _metrics():
+    import metrics
+    metrics.start_export()
+
+
+STEPS = (  # name, step; later steps reuse what earlier ones loaded
+    ("assets",  _assets),
+    ("index",   _index),
+    ("bank",    _bank),
+    ("pack",    _pack),
+    ("daily",   _daily),
+    ("stores",  _stores),
+    ("metrics", _metrics),
+)
+
+
+def warm_up(steps=STEPS):
+    """Run each step once; returns {step: seconds}, with the total under "total"."""
+    timings = {}
+    start = time.perf_counter()
+    for name, step in steps:
+        t = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - t
+    timings["total"] = time.perf_counter() - start
+    return timings
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] != "run" or len(argv) < 2:
+        sys.exit("usage: python -m warmup run app.py [streamlit options]")
+    timings = warm_up()
+    print("warm-up " + " ".join(f"{name}={seconds * 1e3:.0f}ms" for name, seconds in timings.items()),
+          file=sys.stderr, flush=True)
+
+    # Hand over to Streamlit in this process, so the app script finds every cache filled
+    from streamlit.web import cli
+    sys.argv = ["streamlit", *argv]
+    sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    main()
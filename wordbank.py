@@ -0,0 +1,107 @@
+"""Target-word bank.
+
+Levels come from a tab-separated data file (word, category), loaded lazily
+once per process and indexed by category and by length. Sessions draw
+without replacement by walking a keyed pseudorandom permutation of the bank
+with a cursor, so a session only stores (seed, position) however large the
+bank is.
+"""
+import os
+from array import array
+from functools import lru_cache
+
+BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "wordbank.tsv")
+
+_MASK64 = (1 << 64) - 1
+
+
+class WordBank:
+    """Levels stored column-wise: a word list plus a category id per word."""
+
+    __slots__ = ("words", "categories", "category_ids", "by_category", "by_length", "_subsets")
+
+    def __init__(self, rows):
+        self.words        = []
+        self.categories   = []
+        self.category_ids = array("H")
+        self.by_category  = {}
+        self.by_length    = {}
+        self._subsets     = {}
+        ids = {}
+        for word, category in rows:
+            word = word.upper()
+            if category not in ids:
+                ids[category] = len(self.categories)
+                self.categories.append(category)
+            i = len(self.words)
+            self.words.append(word)
+            self.category_ids.append(ids[category])
+            self.by_category.setdefault(category, array("I")).append(i)
+            self.by_length.setdefault(len(word), array("I")).append(i)
+
+    def __len__(self):
+        return len(self.words)
+
+    def level(self, i):
+        """Return level i in the {"word", "clue"} shape the game uses."""
+        word = self.words[i]
+        return {"word": word, "clue": {"length": len(word), "category": self.categories[self.category_ids[i]]}}
+
+    def levels(self):
+        return (self.level(i) for i in range(len(self.words)))
+
+    def subset(self, category=None, length=None):
+        """Ids of levels matching category and/or length, in bank order."""
+        key = (category, length)
+        if key not in self._subsets:
+            if category is None and length is None:
+                ids = array("I", range(len(self.words)))
+            elif length is None:
+                ids = self.by_category.get(category, array("I"))
+            elif category is None:
+                ids = self.by_length.get(length, array("I"))
+            else:
+                wanted = set(self.by_length.get(length, ()))
+                ids = array("I", (i for i in self.by_category.get(category, ()) if i in wanted))
+            self._subsets[key] = ids
+        return self._subsets[key]
+
+    def draw(self, seed, position, category=None, length=None):
+        """Return the level at position in the seed-shuffled order of a subset, or None if empty."""
+        ids = self.subset(category, length)
+        if not ids:
+            return None
+        return self.level(ids[permute(position % len(ids), len(ids), seed)])
+
+
+def _mix(x):
+    """splitmix64 finalizer."""
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9 & _MASK64
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EB & _MASK64
+    return x ^ (x >> 31)
+
+
+def permute(i, n, key):
+    """Map i to its position in a pseudorandom permutation of range(n) chosen by key.
+
+    A four-round Feistel network over the smallest even bit width covering n,
+    with cycle walking to stay below n. Needs no per-permutation storage.
+    """
+    half = max(1, ((n - 1).bit_length() + 1) // 2)
+    mask = (1 << half) - 1
+    x = i
+    while True:
+        left, right = x >> half, x & mask
+        for rnd in range(4):
+            left, right = right, left ^ (_mix(key + rnd * 0x9E3779B97F4A7C15 + right) & mask)
+        x = (left << half) | right
+        if x < n:
+            return x
+
+
+@lru_cache(maxsize=None)
+def load_bank(path=BANK_PATH):
+    """Read the word bank at path once per process."""
+    with open(path, encoding="utf-8") as f:
+        rows = [line.rstrip("\n").split("\t") for line in f if line.strip() and not line.startswith("#")]
+    return WordBank(rows)
@@ -0,0 +1,66 @@
+"""Build data/words.txt, the bundled word index (see dictionary.py).
+
+Candidates come from the pyspellchecker English frequency list (MIT),
+letters only. That list is lowercased spell-checker input, so it also holds
+place and brand names, people and abbreviations (LONDON, PEPSI, ADM). A
+candidate is kept only if a Hunspell dictionary accepts it spelled in
+lower case: Hunspell lists proper nouns and most abbreviations capitalised
+(London, Adm), so those fail, while inflections of real words pass.
+The en_US and en_GB dictionaries (SCOWL-based) are both consulted so
+British spellings stay in. The few abbreviations Hunspell does list in
+lower case (cm, pvt, blvd) have no vowel; words without one are dropped
+too, except the interjections and loanwords in VOWELLESS.
+
+Needs pyspellchecker and spylls, at build time only:
+
+    pip install pyspellchecker spylls
+    python -m wordlist --hunspell /path/to/hunspell/dir --out data/words.txt
+
+The Hunspell directory must contain en_US.dic/.aff and en_GB.dic/.aff
+(e.g. from LibreOffice's dictionaries or the enchant data in pyenchant's
+Windows wheel).
+"""
+import argparse
+import os
+import time
+
+VOWELS = set("aeiouy")
+VOWELLESS = {"brr", "crwth", "cwm", "cwms", "hmm", "nth", "pfft", "psst", "shh", "tsk"}
+
+HEADER = ("# English word list: pyspellchecker en frequency list (MIT), letters only, keeping words\n"
+          "# Hunspell en_US or en_GB accepts in lower case and that have a vowel (no proper nouns\n"
+          "# or abbreviations).\n"
+          "# Built by wordlist.py.\n")
+
+
+def candidates():
+    from spellchecker import SpellChecker
+
+    words = SpellChecker("en").word_frequency.keys()
+    return sorted(w for w in words if w.isascii() and w.isalpha() and (VOWELS.intersection(w) or w in VOWELLESS))
+
+
+def build(hunspell_dir, languages=("en_US", "en_GB")):
+    """Sorted lowercase words of the frequency list that some Hunspell dictionary accepts as written."""
+    from spylls.hunspell import Dictionary
+
+    dictionaries = [Dictionary.from_files(os.path.join(hunspell_dir, lang)) for lang in languages]
+    return [w for w in candidates() if any(d.lookup(w) for d in dictionaries)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hunspell", required=True, help="directory with en_US and en_GB .dic/.aff files")
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "words.txt"))
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    words = build(args.hunspell)
+    with open(args.out, "w", encoding="utf-8") as f:
+        f.write(HEADER)
+        f.writelines(f"{w}\n" for w in words)
+    print(f"{len(words)} words -> {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()